@@ -3,19 +3,55 @@ Flask web server for Egypt Visa Form RPA
 Accepts webhook POST requests with JSON data and returns PDF
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from pathlib import Path
+import os
 import json
+import time
 import logging
-import io
+import queue
+import functools
+import threading
+import concurrent.futures
 import traceback
-from datetime import datetime
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Optional
 
-from form_automation import EgyptVisaFormAutomation, VisaFormFiller
 from data_models import VisaApplication
-from pdf_generator import create_pdf_from_filled_form
+
+if TYPE_CHECKING:
+    from pool import ChromeDriverPool
+
+# Optional faster JSON parser
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson else json.loads
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+if orjson:
+    app.json = OrjsonProvider(app)
+
+# Compress JSON responses only - PDFs are already compressed
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 5
+Compress(app)
 
 # Configure logging
 logging.basicConfig(
@@ -24,15 +60,154 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Load the automation config once per process
+CONFIG_PATH = Path('config/config.json')
+with CONFIG_PATH.open('rb') as f:
+    APP_CONFIG = _json_loads(f.read())
+
+# WebDriver pool settings
+POOL_SIZE = int(os.environ.get('DRIVER_POOL_SIZE', 2))
+MAX_DRIVER_USES = int(os.environ.get('DRIVER_MAX_USES', 50))
+POOL_ACQUIRE_TIMEOUT = 0.5
+RETRY_AFTER_SECONDS = 5
+PDF_TIMEOUT = int(os.environ.get('PDF_TIMEOUT', 240))
+# Set to 0 to launch each browser on first use instead of at startup
+POOL_PREWARM = os.environ.get('DRIVER_PREWARM', '1') != '0'
+
+# Pre-launched browsers shared by all requests (created lazily so every
+# gunicorn worker gets its own)
+_driver_pool: Optional['ChromeDriverPool'] = None
+_pool_lock = threading.Lock()
+
+# Number of PDF requests currently being handled
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+# Blocking Selenium sessions run here, one thread per pooled browser
+driver_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=POOL_SIZE,
+    thread_name_prefix='selenium'
+)
+
+
+# Selenium/PDF modules, imported on first use so /health is ready quickly
+_heavy = None
+
+
+def _load_heavy() -> SimpleNamespace:
+    """Import the Selenium and PDF modules once and memoize them"""
+    global _heavy
+    if _heavy is None:
+        from form_automation import EgyptVisaFormAutomation, VisaFormFiller
+        from pdf_generator import create_pdf_from_filled_form
+        from pool import ChromeDriverPool
+        _heavy = SimpleNamespace(
+            EgyptVisaFormAutomation=EgyptVisaFormAutomation,
+            VisaFormFiller=VisaFormFiller,
+            create_pdf_from_filled_form=create_pdf_from_filled_form,
+            ChromeDriverPool=ChromeDriverPool
+        )
+    return _heavy
+
+
+def get_driver_pool() -> 'ChromeDriverPool':
+    """Create this process's WebDriver pool on first use"""
+    global _driver_pool
+    with _pool_lock:
+        if _driver_pool is None:
+            # Park idle browsers on the form so requests skip the first page load
+            _driver_pool = _load_heavy().ChromeDriverPool(
+                APP_CONFIG,
+                size=POOL_SIZE,
+                max_uses=MAX_DRIVER_USES,
+                start_url=APP_CONFIG['url'],
+                prewarm=POOL_PREWARM
+            )
+    return _driver_pool
+
+
+def init_driver_pool():
+    """Fill the pool with pre-warmed browsers (once per process)"""
+    get_driver_pool().start()
+
+
+def _run_selenium(driver, app_obj: VisaApplication) -> Path:
+    """Fill the form and generate the PDF on a borrowed browser"""
+    heavy = _load_heavy()
+    
+    automation = heavy.EgyptVisaFormAutomation.from_config(APP_CONFIG, driver=driver)
+    if driver.current_url != APP_CONFIG['url']:
+        automation.navigate_to_form()
+    
+    logger.info("Filling form...")
+    filler = heavy.VisaFormFiller(automation)
+    filler.fill_complete_form(app_obj)
+    
+    logger.info("Generating PDF with QR code...")
+    pdf_path = heavy.create_pdf_from_filled_form(automation, app_obj, click_create_button=True)
+    
+    if not pdf_path or not pdf_path.exists():
+        raise Exception("PDF generation failed - file not created")
+    
+    logger.info(f"✓ PDF generated successfully: {pdf_path}")
+    return pdf_path
+
+
+def _submit_selenium(driver, app_obj: VisaApplication) -> concurrent.futures.Future:
+    """Start a Selenium session; the browser goes back to the pool once it ends"""
+    future = driver_executor.submit(_run_selenium, driver, app_obj)
+    
+    # Done-callbacks run after the result is published, so reloading the form
+    # for the next request does not delay this response
+    future.add_done_callback(
+        lambda f: get_driver_pool().release(driver, failed=f.exception() is not None)
+    )
+    return future
+
+
+def _track_in_flight(delta: int):
+    """Adjust the in-flight request counter"""
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight += delta
+
+
+def _discard_pdf(future: concurrent.futures.Future):
+    """Remove the PDF of a session whose request already timed out"""
+    if future.exception() is None:
+        future.result().unlink(missing_ok=True)
+
+
+@functools.lru_cache(maxsize=1)
+def _iso_for_second(second: int) -> str:
+    """ISO-8601 UTC timestamp for a whole second"""
+    return datetime.fromtimestamp(second, timezone.utc).isoformat(timespec='seconds')
+
+
+def _fast_iso() -> str:
+    """Current UTC timestamp, formatted at most once per second"""
+    return _iso_for_second(int(time.time()))
+
+
+def _err(status: int, msg: str, details=None, headers: dict = None):
+    """Build a timestamped JSON error response"""
+    body = {'error': msg, 'timestamp': _fast_iso()}
+    if details is not None:
+        body['details'] = details
+    if headers:
+        return jsonify(body), status, headers
+    return jsonify(body), status
+
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint for Railway"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'Egypt Visa Form RPA',
-        'timestamp': datetime.now().isoformat()
-    }), 200
+    body = (
+        b'{"status":"healthy","service":"Egypt Visa Form RPA","timestamp":"'
+        + _fast_iso().encode()
+        + b'"}'
+    )
+    return Response(body, mimetype='application/json')
 
 
 @app.route('/generate-visa-pdf', methods=['POST'])
@@ -43,129 +218,122 @@ def generate_visa_pdf():
     Request body: JSON with visa application data
     Response: PDF file
     """
+    _track_in_flight(1)
     try:
         # Get JSON data from request
         if not request.is_json:
-            return jsonify({
-                'error': 'Request must be JSON',
-                'timestamp': datetime.now().isoformat()
-            }), 400
-        
-        application_data = request.get_json()
-        logger.info(f"Received visa application request for: {application_data.get('personal_info', {}).get('first_name', 'Unknown')}")
+            return _err(400, 'Request must be JSON')
+        try:
+            application_data = _json_loads(request.get_data(cache=False))
+        except ValueError:
+            return _err(400, 'Request must be JSON')
         
         # Validate and create VisaApplication object
         try:
             app_obj = VisaApplication(application_data)
+            logger.info(f"Received visa application request for: {app_obj.full_name}")
             is_valid, errors = app_obj.validate()
             
             if not is_valid:
                 logger.error(f"Validation failed: {errors}")
-                return jsonify({
-                    'error': 'Validation failed',
-                    'details': errors,
-                    'timestamp': datetime.now().isoformat()
-                }), 400
+                return _err(400, 'Validation failed', errors)
             
         except Exception as e:
             logger.error(f"Error parsing application data: {e}")
-            return jsonify({
-                'error': 'Invalid application data format',
-                'details': str(e),
-                'timestamp': datetime.now().isoformat()
-            }), 400
+            return _err(400, 'Invalid application data format', str(e))
         
-        # Initialize automation
-        config_path = Path('config/config.json')
-        automation = EgyptVisaFormAutomation(config_path)
+        # Borrow a browser, or tell the client to back off if all are busy
+        try:
+            driver = get_driver_pool().acquire(timeout=POOL_ACQUIRE_TIMEOUT)
+        except queue.Empty:
+            logger.warning("All WebDrivers busy - rejecting request")
+            return _err(503, 'All browsers are busy, retry later',
+                        headers={'Retry-After': str(RETRY_AFTER_SECONDS)})
         
+        # Run the Selenium session off the request thread
+        future = _submit_selenium(driver, app_obj)
         try:
-            # Setup and run automation
-            logger.info("Setting up Chrome WebDriver...")
-            automation.setup_driver()
-            
-            logger.info("Navigating to form...")
-            automation.navigate_to_form()
-            
-            logger.info("Filling form...")
-            filler = VisaFormFiller(automation)
-            filler.fill_complete_form(app_obj)
-            
-            logger.info("Generating PDF with QR code...")
-            pdf_path = create_pdf_from_filled_form(automation, app_obj, click_create_button=True)
-            
-            if not pdf_path or not pdf_path.exists():
-                raise Exception("PDF generation failed - file not created")
-            
-            logger.info(f"✓ PDF generated successfully: {pdf_path}")
-            
-            # Read PDF into memory
-            with open(pdf_path, 'rb') as f:
-                pdf_data = f.read()
-            
-            # Clean up PDF file
-            pdf_path.unlink()
-            
-            # Get applicant name for filename
-            filename = app_obj.get_output_filename()
-            
-            logger.info(f"✓ Sending PDF: {filename} ({len(pdf_data)} bytes)")
-            
-            # Return PDF as response
-            return send_file(
-                io.BytesIO(pdf_data),
-                mimetype='application/pdf',
-                as_attachment=True,
-                download_name=filename
-            )
-            
-        finally:
-            # Always close browser
-            try:
-                automation.quit()
-            except:
-                pass
+            pdf_path = future.result(timeout=PDF_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            # Let the session finish in the background and drop its output
+            future.add_done_callback(_discard_pdf)
+            logger.error(f"PDF generation timed out after {PDF_TIMEOUT}s")
+            return _err(504, 'PDF generation timed out')
+        
+        # Get applicant name for filename
+        filename = app_obj.get_output_filename()
+        
+        logger.info(f"✓ Sending PDF: {filename} ({pdf_path.stat().st_size} bytes)")
+        
+        # Stream the PDF straight from disk
+        response = send_file(
+            str(pdf_path),
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=filename,
+            conditional=True
+        )
+        
+        # Clean up PDF file once it has been sent
+        @response.call_on_close
+        def _cleanup_pdf():
+            pdf_path.unlink(missing_ok=True)
+        
+        return response
     
     except Exception as e:
         logger.error(f"Error generating PDF: {e}")
         logger.error(traceback.format_exc())
         
-        return jsonify({
-            'error': 'PDF generation failed',
-            'details': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+        return _err(500, 'PDF generation failed', str(e))
+    
+    finally:
+        _track_in_flight(-1)
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """WebDriver pool usage for autoscaling"""
+    return jsonify({
+        'pool_size': POOL_SIZE,
+        'drivers_available': _driver_pool.available() if _driver_pool else 0,
+        'requests_in_flight': _in_flight
+    }), 200
+
+
+# Static API documentation, serialized once at import
+_INDEX_BODY = app.json.dumps({
+    'service': 'Egypt Visa Form RPA API',
+    'version': '1.0',
+    'endpoints': {
+        'POST /generate-visa-pdf': 'Generate visa PDF from JSON data',
+        'GET /health': 'Health check endpoint',
+        'GET /metrics': 'WebDriver pool usage',
+        'GET /': 'This documentation'
+    },
+    'usage': {
+        'method': 'POST',
+        'url': '/generate-visa-pdf',
+        'headers': {
+            'Content-Type': 'application/json'
+        },
+        'body': 'JSON with visa application data (see data/sample_application.json)',
+        'response': 'PDF file (application/pdf)'
+    },
+    'example': {
+        'curl': 'curl -X POST http://your-app.railway.app/generate-visa-pdf -H "Content-Type: application/json" -d @data/sample_application.json --output visa.pdf'
+    }
+})
 
 
 @app.route('/', methods=['GET'])
 def index():
     """Root endpoint with API documentation"""
-    return jsonify({
-        'service': 'Egypt Visa Form RPA API',
-        'version': '1.0',
-        'endpoints': {
-            'POST /generate-visa-pdf': 'Generate visa PDF from JSON data',
-            'GET /health': 'Health check endpoint',
-            'GET /': 'This documentation'
-        },
-        'usage': {
-            'method': 'POST',
-            'url': '/generate-visa-pdf',
-            'headers': {
-                'Content-Type': 'application/json'
-            },
-            'body': 'JSON with visa application data (see data/sample_application.json)',
-            'response': 'PDF file (application/pdf)'
-        },
-        'example': {
-            'curl': 'curl -X POST http://your-app.railway.app/generate-visa-pdf -H "Content-Type: application/json" -d @data/sample_application.json --output visa.pdf'
-        }
-    }), 200
+    return Response(_INDEX_BODY, mimetype='application/json')
 
 
 if __name__ == '__main__':
     # For local testing
-    import os
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
+    app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
 
@@ -2,15 +2,29 @@
 Data models and validation for Egypt visa application form
 """
 
+import re
 import json
-from datetime import datetime
-from typing import List, Dict, Optional
+import secrets
+from datetime import datetime, date
+from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Optional faster JSON parser
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_UNSAFE_FILENAME_RE = re.compile(r'[^A-Za-z0-9_-]')
+
 
 class Relative:
     """Model for relative/friend in Egypt"""
     
+    __slots__ = ('full_name', 'address')
+    
     def __init__(self, full_name: str, address: str):
         self.full_name = full_name
         self.address = address
@@ -31,6 +45,68 @@ class Relative:
 class VisaApplication:
     """Model for complete visa application"""
     
+    __slots__ = (
+        'data',
+        'first_name', 'middle_name', 'family_name', 'date_of_birth',
+        'place_of_birth', 'sex', 'marital_status',
+        'present_nationality', 'nationality_of_origin',
+        'occupation_arabic',
+        'passport_number', 'passport_type', 'issued_at', 'issued_on', 'expires_on',
+        'permanent_address', 'present_address',
+        'visa_type', 'duration_of_stay', 'date_of_arrival', 'purpose_of_visit',
+        'address_in_egypt', 'port_of_entry',
+        'phone_number',
+        'relatives',
+        'full_name',
+        '_parsed_dates',
+    )
+    
+    # (attribute, label) pairs that must be non-empty
+    _REQUIRED = (
+        ('first_name', 'First name'),
+        ('middle_name', 'Middle name'),
+        ('family_name', 'Family name'),
+        ('date_of_birth', 'Date of birth'),
+        ('place_of_birth', 'Place of birth'),
+        ('sex', 'Sex'),
+        ('marital_status', 'Marital status'),
+        ('present_nationality', 'Present nationality'),
+        ('nationality_of_origin', 'Nationality of origin'),
+        ('occupation_arabic', 'Occupation (in Arabic)'),
+        ('passport_number', 'Passport number'),
+        ('passport_type', 'Passport type'),
+        ('issued_at', 'Passport issued at'),
+        ('issued_on', 'Passport issued on date'),
+        ('expires_on', 'Passport expires on date'),
+        ('permanent_address', 'Permanent address'),
+        ('present_address', 'Present address'),
+        ('visa_type', 'Visa type'),
+        ('duration_of_stay', 'Duration of stay'),
+        ('date_of_arrival', 'Date of arrival'),
+        ('purpose_of_visit', 'Purpose of visit'),
+        ('address_in_egypt', 'Address in Egypt'),
+        ('port_of_entry', 'Port of entry'),
+        ('phone_number', 'Phone number'),
+    )
+    
+    # (attribute, allowed values, error message) for enumerated fields
+    _ENUMS = (
+        ('sex', frozenset({'Male', 'Female'}),
+         "Invalid sex value: {}. Must be 'Male' or 'Female'"),
+        ('marital_status', frozenset({'Single', 'Married', 'Widow', 'Widower'}),
+         "Invalid marital status: {}"),
+        ('visa_type', frozenset({'Single', 'Multiple'}),
+         "Invalid visa type: {}. Must be 'Single' or 'Multiple'"),
+    )
+    
+    # (attribute, label) pairs for YYYY-MM-DD date fields
+    _DATES = (
+        ('date_of_birth', 'date of birth'),
+        ('issued_on', 'passport issued date'),
+        ('expires_on', 'passport expiry date'),
+        ('date_of_arrival', 'arrival date'),
+    )
+    
     def __init__(self, data: dict):
         self.data = data
         
@@ -82,6 +158,16 @@ class VisaApplication:
         # Relatives in Egypt
         relatives_data = data.get('relatives_in_egypt', [])
         self.relatives = [Relative.from_dict(r) for r in relatives_data]
+        
+        # Display name used in logs
+        self.full_name = f"{self.first_name} {self.family_name}"
+        
+        # Parse each date once so validation and form filling share the result
+        self._parsed_dates = {
+            name: self._parse_date(getattr(self, name))
+            for name, _ in self._DATES
+            if getattr(self, name)
+        }
     
     def validate(self) -> tuple[bool, list[str]]:
         """
@@ -90,92 +176,21 @@ class VisaApplication:
         """
         errors = []
         
-        # Required personal fields
-        if not self.first_name:
-            errors.append("First name is required")
-        if not self.middle_name:
-            errors.append("Middle name is required")
-        if not self.family_name:
-            errors.append("Family name is required")
-        if not self.date_of_birth:
-            errors.append("Date of birth is required")
-        if not self.place_of_birth:
-            errors.append("Place of birth is required")
-        if not self.sex:
-            errors.append("Sex is required")
-        if not self.marital_status:
-            errors.append("Marital status is required")
-        
-        # Validate sex value
-        if self.sex and self.sex not in ['Male', 'Female']:
-            errors.append(f"Invalid sex value: {self.sex}. Must be 'Male' or 'Female'")
-        
-        # Validate marital status
-        valid_marital = ['Single', 'Married', 'Widow', 'Widower']
-        if self.marital_status and self.marital_status not in valid_marital:
-            errors.append(f"Invalid marital status: {self.marital_status}")
-        
-        # Required nationality fields
-        if not self.present_nationality:
-            errors.append("Present nationality is required")
-        if not self.nationality_of_origin:
-            errors.append("Nationality of origin is required")
-        
-        # Required occupation
-        if not self.occupation_arabic:
-            errors.append("Occupation (in Arabic) is required")
-        
-        # Required passport fields
-        if not self.passport_number:
-            errors.append("Passport number is required")
-        if not self.passport_type:
-            errors.append("Passport type is required")
-        if not self.issued_at:
-            errors.append("Passport issued at is required")
-        if not self.issued_on:
-            errors.append("Passport issued on date is required")
-        if not self.expires_on:
-            errors.append("Passport expires on date is required")
-        
-        # Validate dates
-        if self.date_of_birth:
-            if not self._validate_date(self.date_of_birth):
-                errors.append(f"Invalid date of birth format: {self.date_of_birth}")
-        if self.issued_on:
-            if not self._validate_date(self.issued_on):
-                errors.append(f"Invalid passport issued date format: {self.issued_on}")
-        if self.expires_on:
-            if not self._validate_date(self.expires_on):
-                errors.append(f"Invalid passport expiry date format: {self.expires_on}")
-        if self.date_of_arrival:
-            if not self._validate_date(self.date_of_arrival):
-                errors.append(f"Invalid arrival date format: {self.date_of_arrival}")
-        
-        # Required address fields
-        if not self.permanent_address:
-            errors.append("Permanent address is required")
-        if not self.present_address:
-            errors.append("Present address is required")
-        
-        # Required visa fields
-        if not self.visa_type:
-            errors.append("Visa type is required")
-        if self.visa_type and self.visa_type not in ['Single', 'Multiple']:
-            errors.append(f"Invalid visa type: {self.visa_type}. Must be 'Single' or 'Multiple'")
-        if not self.duration_of_stay:
-            errors.append("Duration of stay is required")
-        if not self.date_of_arrival:
-            errors.append("Date of arrival is required")
-        if not self.purpose_of_visit:
-            errors.append("Purpose of visit is required")
-        if not self.address_in_egypt:
-            errors.append("Address in Egypt is required")
-        if not self.port_of_entry:
-            errors.append("Port of entry is required")
-        
-        # Required contact
-        if not self.phone_number:
-            errors.append("Phone number is required")
+        # Required fields
+        for name, label in self._REQUIRED:
+            if not getattr(self, name):
+                errors.append(f"{label} is required")
+        
+        # Fields restricted to a fixed set of values
+        for name, allowed, message in self._ENUMS:
+            value = getattr(self, name)
+            if value and value not in allowed:
+                errors.append(message.format(value))
+        
+        # Date formats (parsed once in __init__)
+        for name, label in self._DATES:
+            if name in self._parsed_dates and self._parsed_dates[name] is None:
+                errors.append(f"Invalid {label} format: {getattr(self, name)}")
         
         # Validate relatives
         for idx, relative in enumerate(self.relatives):
@@ -185,27 +200,42 @@ class VisaApplication:
         return len(errors) == 0, errors
     
     @staticmethod
-    def _validate_date(date_str: str) -> bool:
-        """Validate date format (YYYY-MM-DD)"""
+    def _parse_date(date_str: str) -> Optional[date]:
+        """Parse a YYYY-MM-DD date, returning None if the format is invalid"""
         try:
-            datetime.strptime(date_str, '%Y-%m-%d')
-            return True
+            return datetime.strptime(date_str, '%Y-%m-%d').date()
         except ValueError:
-            return False
+            return None
+    
+    def parsed_date(self, name: str) -> Optional[date]:
+        """Return the parsed value of a date field (None if empty or invalid)"""
+        return self._parsed_dates.get(name)
     
     def get_output_filename(self) -> str:
-        """Generate output filename for the PDF"""
+        """Generate a unique, filesystem-safe output filename for the PDF"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        return f"{self.first_name}_{self.family_name}_{timestamp}.pdf"
+        first_name = _UNSAFE_FILENAME_RE.sub('_', self.first_name)
+        family_name = _UNSAFE_FILENAME_RE.sub('_', self.family_name)
+        # Random suffix keeps concurrent requests for the same applicant apart
+        return f"{first_name}_{family_name}_{timestamp}_{secrets.token_hex(4)}.pdf"
     
     @classmethod
     def from_json_file(cls, filepath: Path):
         """Load visa application from JSON file"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
         return cls(data)
 
 
+def _safe_load(json_file: Path) -> Tuple[Optional['VisaApplication'], Optional[Exception]]:
+    """Load one application file, returning the error instead of raising"""
+    try:
+        return VisaApplication.from_json_file(json_file), None
+    except Exception as e:
+        return None, e
+
+
 def load_applications_from_directory(directory: Path) -> List[VisaApplication]:
     """
     Load all JSON application files from a directory
@@ -213,12 +243,15 @@ def load_applications_from_directory(directory: Path) -> List[VisaApplication]:
     applications = []
     json_files = list(directory.glob('*.json'))
     
-    for json_file in json_files:
-        try:
-            app = VisaApplication.from_json_file(json_file)
+    # File reads dominate, so load the files concurrently
+    with ThreadPoolExecutor(max_workers=min(32, len(json_files) or 1)) as executor:
+        results = list(executor.map(_safe_load, json_files))
+    
+    for json_file, (app, error) in zip(json_files, results):
+        if error is not None:
+            print(f"Error loading {json_file}: {error}")
+        else:
             applications.append(app)
-        except Exception as e:
-            print(f"Error loading {json_file}: {e}")
     
     return applications
 
@@ -239,4 +272,9 @@ if __name__ == "__main__":
                 print(f"  - {error}")
     else:
         print(f"Sample file not found: {sample_file}")
+    
+    # Unpadded dates were accepted by strptime before the table-driven rewrite
+    assert VisaApplication._parse_date('2020-1-5') == date(2020, 1, 5)
+    assert VisaApplication._parse_date('2020-13-01') is None
+    print("✓ Date parsing accepts unpadded YYYY-M-D dates")
 
@@ -2,11 +2,16 @@
 Selenium-based form automation for Egypt visa application
 """
 
+import os
+import atexit
+import queue
+import shutil
 import json
-import time
 import logging
+import logging.handlers
+import threading
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from selenium import webdriver
@@ -15,104 +20,289 @@ from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 
 from data_models import VisaApplication
 
 
+# Guards the one-time handler setup of the shared automation logger
+_logger_lock = threading.Lock()
+
+# Name inputs of all relatives on the form (arPersonName_0, arPersonName_1, ...)
+RELATIVE_NAME_INPUTS = "input[name^='arPersonName_']"
+
+# Text fields the filler leaves untouched when empty
+OPTIONAL_TEXT_FIELDS = frozenset({'middle_name'})
+
+# Every date on the form reuses the birthday[...] dropdown names
+BIRTHDAY_MONTH = "select[name='birthday[month]']"
+BIRTHDAY_DAY = "select[name='birthday[day]']"
+BIRTHDAY_YEAR = "select[name='birthday[year]']"
+
+# Which set of birthday[...] dropdowns (in page order) holds each date
+_BIRTHDAY_INDEX = {
+    'date_of_birth': 0,
+    'issued_on': 1,
+    'expires_on': 2,
+    'date_of_arrival': 3
+}
+
+# Month options as shown in the date dropdowns
+_MONTHS = {
+    1: "يناير / January",
+    2: "فبراير / February",
+    3: "مارس / March",
+    4: "أبريل / April",
+    5: "مايو / May",
+    6: "يونيو / June",
+    7: "يوليو / July",
+    8: "أغسطس / August",
+    9: "سبتمبر / September",
+    10: "أكتوبر / October",
+    11: "نوفمبر / November",
+    12: "ديسمبر / December"
+}
+
+# Sets many fields in one round trip. Takes [selector, index, value, isSelect]
+# entries and returns the positions of entries it could not set.
+_BATCH_FILL_JS = """
+const failed = [];
+arguments[0].forEach(([selector, index, value, isSelect], i) => {
+    const el = document.querySelectorAll(selector)[index];
+    if (!el) { failed.push(i); return; }
+    if (isSelect) {
+        const option = Array.from(el.options).find(o => o.text.trim() === value);
+        if (!option) { failed.push(i); return; }
+        el.value = option.value;
+    } else {
+        el.value = value;
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+});
+return failed;
+"""
+
+# Print preview settings: always "Save as PDF", no headers/footers
+_PRINT_PREFS_JSON = json.dumps({
+    'recentDestinations': [{
+        'id': 'Save as PDF',
+        'origin': 'local',
+        'account': ''
+    }],
+    'selectedDestinationId': 'Save as PDF',
+    'version': 2,
+    'isHeaderFooterEnabled': False,
+    'marginsType': 0,  # Default margins
+    'scaling': 100,
+    'scalingType': 3,
+    'scalingTypePdf': 3
+})
+
+# Web fonts are not needed to fill the form, but the same session prints the
+# PDF and the bilingual labels need them, so blocking is off by default
+# (browser.block_resources). Images and CSS are never blocked.
+BLOCKED_RESOURCE_URLS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+
+# Registered before every page load: counts in-flight XHR/fetch requests in
+# window.__activeReq so PDFGenerator.detect_network_idle reads a single number
+_NETWORK_HOOK_JS = """
+(() => {
+    if (window.__activeReq !== undefined) return;
+    window.__activeReq = 0;
+    const done = () => { window.__activeReq--; };
+    
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function(...args) {
+        window.__activeReq++;
+        this.addEventListener('loadend', done, {once: true});
+        try {
+            return send.apply(this, args);
+        } catch (e) {
+            done();
+            throw e;
+        }
+    };
+    
+    const fetch = window.fetch;
+    window.fetch = function(...args) {
+        window.__activeReq++;
+        try {
+            return fetch.apply(this, args).finally(done);
+        } catch (e) {
+            done();
+            throw e;
+        }
+    };
+})();
+"""
+
+# Picks the option with the given visible text in one round trip; returns
+# false if no option matches
+_SELECT_BY_TEXT_JS = """
+const select = arguments[0];
+const option = Array.from(select.options).find(o => o.text.trim() === arguments[1]);
+if (!option) return false;
+select.value = option.value;
+select.dispatchEvent(new Event('change', {bubbles: true}));
+return true;
+"""
+
+_FOCUS_AND_CLEAR_JS = "arguments[0].focus(); arguments[0].value = '';"
+_FIRE_INPUT_EVENTS_JS = (
+    "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));"
+    "arguments[0].dispatchEvent(new Event('change', {bubbles: true}));"
+)
+
+
 class EgyptVisaFormAutomation:
     """Automates filling Egypt visa application form"""
     
-    def __init__(self, config_path: Path):
-        """Initialize automation with config file"""
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = json.load(f)
+    # ChromeDriver binary found by the first successful create_driver() call
+    _CHROMEDRIVER_PATH: Optional[str] = None
+    
+    def __init__(self, config_path: Optional[Path], config: Optional[dict] = None,
+                 driver: Optional[webdriver.Chrome] = None):
+        """
+        Initialize automation with config file (or an already parsed config)
+        
+        A driver borrowed from a ChromeDriverPool can be passed in; it is then
+        used as-is and left running by quit().
+        """
+        if config is None:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        self.config = config
+        
+        # Selector strings and ready-made locators for every configured field
+        self._sel: dict[str, str] = config['form_selectors']
+        self._locators: dict[str, tuple[str, str]] = {
+            name: (By.CSS_SELECTOR, selector) for name, selector in self._sel.items()
+        }
         
         self.driver: Optional[webdriver.Chrome] = None
         self.wait: Optional[WebDriverWait] = None
         self.logger = self._setup_logger()
+        
+        # Elements resolved on the current page, reset on navigation
+        self._element_cache: dict[str, WebElement] = {}
+        self._birthday_months: Optional[list] = None
+        self._birthday_days: Optional[list] = None
+        self._birthday_years: Optional[list] = None
+        
+        self._owns_driver = driver is None
+        if driver is not None:
+            self._attach_driver(driver)
+    
+    @classmethod
+    def from_config(cls, config: dict,
+                    driver: Optional[webdriver.Chrome] = None) -> 'EgyptVisaFormAutomation':
+        """Create automation from a parsed config, skipping file I/O"""
+        return cls(None, config, driver)
     
     def _setup_logger(self) -> logging.Logger:
-        """Setup logger for automation"""
+        """Setup logger for automation (handlers are added once per process)"""
         logger = logging.getLogger('EgyptVisaAutomation')
-        logger.setLevel(logging.INFO)
         
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # File handler
-        log_dir = Path('logs')
-        log_dir.mkdir(exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        file_handler = logging.FileHandler(
-            log_dir / f'automation_{timestamp}.log',
-            encoding='utf-8'
-        )
-        file_handler.setLevel(logging.DEBUG)
-        
-        # Format
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(formatter)
-        file_handler.setFormatter(formatter)
-        
-        logger.addHandler(console_handler)
-        logger.addHandler(file_handler)
+        with _logger_lock:
+            if logger.handlers:
+                return logger
+            
+            logger.setLevel(logging.INFO)
+            
+            # Console handler
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            
+            # File handler
+            log_dir = Path('logs')
+            log_dir.mkdir(exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            file_handler = logging.FileHandler(
+                log_dir / f'automation_{timestamp}.log',
+                encoding='utf-8'
+            )
+            file_handler.setLevel(logging.DEBUG)
+            
+            # Format
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+            console_handler.setFormatter(formatter)
+            file_handler.setFormatter(formatter)
+            
+            # Callers only enqueue records; a background listener does the
+            # formatting and console/file I/O
+            log_queue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(
+                log_queue, console_handler, file_handler,
+                respect_handler_level=True
+            )
+            listener.start()
+            atexit.register(listener.stop)
+            
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
         
         return logger
     
     def setup_driver(self):
         """Initialize Selenium WebDriver"""
         self.logger.info("Setting up Chrome WebDriver...")
-        
+        self._attach_driver(self.create_driver())
+        self._owns_driver = True
+        self.logger.info("WebDriver setup complete")
+    
+    @staticmethod
+    def _build_chrome_options(config: dict) -> Options:
+        """Build the Chrome options shared by every driver"""
         chrome_options = Options()
         
         # Headless mode (force headless in production/Railway environment)
-        import os
-        if self.config['browser']['headless'] or os.environ.get('RAILWAY_ENVIRONMENT'):
+        if config['browser']['headless'] or os.environ.get('RAILWAY_ENVIRONMENT'):
             chrome_options.add_argument('--headless=new')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
+            # Nothing watches a headless browser - skip its background traffic
+            chrome_options.add_argument('--disable-background-networking')
+            chrome_options.add_argument('--disable-extensions')
+            chrome_options.add_argument('--disable-default-apps')
+            chrome_options.add_argument('--no-first-run')
+            chrome_options.add_argument('--mute-audio')
         
         # Window size
-        window_size = self.config['browser']['window_size']
+        window_size = config['browser']['window_size']
         chrome_options.add_argument(f"--window-size={window_size['width']},{window_size['height']}")
         
-        # Additional options for stability
+        # Additional options for stability and faster startup
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         
         # Set download directory for PDFs
-        output_dir = str(Path(self.config['output']['pdf_directory']).absolute())
+        output_dir = str(Path(config['output']['pdf_directory']).absolute())
         prefs = {
             'download.default_directory': output_dir,
             'download.prompt_for_download': False,
             'download.directory_upgrade': True,
             'plugins.always_open_pdf_externally': True,
-            'printing.print_preview_sticky_settings.appState': json.dumps({
-                'recentDestinations': [{
-                    'id': 'Save as PDF',
-                    'origin': 'local',
-                    'account': ''
-                }],
-                'selectedDestinationId': 'Save as PDF',
-                'version': 2,
-                'isHeaderFooterEnabled': False,
-                'marginsType': 0,  # Default margins
-                'scaling': 100,
-                'scalingType': 3,
-                'scalingTypePdf': 3
-            }),
+            'printing.print_preview_sticky_settings.appState': _PRINT_PREFS_JSON,
             'savefile.default_directory': output_dir,
             'profile.default_content_settings.popups': 0,
             'profile.default_content_setting_values.automatic_downloads': 1
         }
         chrome_options.add_experimental_option('prefs', prefs)
         
+        # Return from driver.get once the DOM is interactive
+        if config['browser'].get('eager_page_load', False):
+            chrome_options.page_load_strategy = 'eager'
+        
+        return chrome_options
+    
+    def create_driver(self) -> webdriver.Chrome:
+        """Launch Chrome with the configured options and timeouts"""
+        chrome_options = self._build_chrome_options(self.config)
+        block_resources = self.config['browser'].get('block_resources', False)
+        
         # Initialize driver - try multiple methods
         # List of paths to try
         project_root = Path(__file__).parent
@@ -123,31 +313,42 @@ class EgyptVisaFormAutomation:
             '/usr/bin/chromedriver',
         ]
         
-        driver_found = False
+        driver = None
+        
+        # Reuse the path that worked for an earlier driver in this process,
+        # otherwise try whatever chromedriver is on PATH before the fixed locations
+        cached_path = EgyptVisaFormAutomation._CHROMEDRIVER_PATH
+        if cached_path and Path(cached_path).exists():
+            common_paths = [cached_path]
+        else:
+            path_driver = shutil.which('chromedriver')
+            if path_driver:
+                common_paths.insert(0, path_driver)
         
         # Method 1: Try each path
         for path in common_paths:
             if Path(path).exists():
                 try:
                     service = Service(executable_path=str(path))
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                    driver = webdriver.Chrome(service=service, options=chrome_options)
+                    EgyptVisaFormAutomation._CHROMEDRIVER_PATH = str(path)
                     self.logger.info(f"Using ChromeDriver from: {path}")
-                    driver_found = True
                     break
                 except Exception as e:
                     self.logger.warning(f"Failed to use ChromeDriver at {path}: {e}")
+                    if str(path) == cached_path:
+                        EgyptVisaFormAutomation._CHROMEDRIVER_PATH = None
                     continue
         
-        # Method 2: Try system PATH (no explicit path)
-        if not driver_found:
+        # Method 2: Let Selenium locate a driver itself (Selenium Manager)
+        if driver is None:
             try:
-                self.driver = webdriver.Chrome(options=chrome_options)
-                self.logger.info("Using ChromeDriver from system PATH")
-                driver_found = True
+                driver = webdriver.Chrome(options=chrome_options)
+                self.logger.info("Using ChromeDriver located by Selenium")
             except Exception as e:
                 self.logger.warning(f"System ChromeDriver not found: {e}")
         
-        if not driver_found:
+        if driver is None:
             raise Exception(
                 "\n\nChrome Driver not found!\n\n"
                 "To install ChromeDriver:\n"
@@ -159,39 +360,117 @@ class EgyptVisaFormAutomation:
                 "See SETUP_INSTRUCTIONS.md for more details."
             )
         
-        # Set timeouts
-        self.driver.implicitly_wait(self.config['browser']['implicit_wait'])
-        self.driver.set_page_load_timeout(self.config['browser']['page_load_timeout'])
+        # Set timeouts - element lookups rely on explicit waits only
+        driver.implicitly_wait(0)
+        driver.set_page_load_timeout(self.config['browser']['page_load_timeout'])
         
-        # Initialize WebDriverWait
+        # Track pending requests on every page this driver loads
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': _NETWORK_HOOK_JS})
+        
+        if block_resources:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_URLS})
+        
+        return driver
+    
+    def _attach_driver(self, driver: webdriver.Chrome):
+        """Use the given driver for all further steps"""
+        self.driver = driver
         self.wait = WebDriverWait(
             self.driver,
             self.config['timeouts']['element_wait']
         )
-        
-        self.logger.info("WebDriver setup complete")
+        self._clear_element_cache()
     
     def navigate_to_form(self):
         """Navigate to the visa application form"""
         url = self.config['url']
         self.logger.info(f"Navigating to {url}")
         self.driver.get(url)
-        time.sleep(2)  # Allow page to fully load
+        # Elements from the previous page are gone
+        self._clear_element_cache()
+        # Wait until the form is usable rather than a fixed delay
+        self.wait.until(EC.presence_of_element_located(self._locators['first_name']))
         self.logger.info("Page loaded successfully")
     
+    def _clear_element_cache(self):
+        """Forget all resolved elements (after navigation or a stale element)"""
+        self._element_cache.clear()
+        self._birthday_months = None
+        self._birthday_days = None
+        self._birthday_years = None
+    
+    def _get(self, field_name: str) -> WebElement:
+        """Return the element for a configured field, resolving it once per page"""
+        element = self._element_cache.get(field_name)
+        if element is None:
+            element = self.wait.until(
+                EC.presence_of_element_located(self._locators[field_name])
+            )
+            self._element_cache[field_name] = element
+        return element
+    
+    def _birthday_dropdowns(self, index: int) -> tuple[list, list, list]:
+        """Return all birthday[month/day/year] dropdowns, looked up once per page"""
+        if self._birthday_months is None or len(self._birthday_months) <= index:
+            # Wait until the index-th set exists instead of returning a short list
+            self.wait.until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, BIRTHDAY_YEAR)) > index
+            )
+            self._birthday_months = self.driver.find_elements(By.CSS_SELECTOR, BIRTHDAY_MONTH)
+            self._birthday_days = self.driver.find_elements(By.CSS_SELECTOR, BIRTHDAY_DAY)
+            self._birthday_years = self.driver.find_elements(By.CSS_SELECTOR, BIRTHDAY_YEAR)
+        return self._birthday_months, self._birthday_days, self._birthday_years
+    
+    def _retry_stale(self, action):
+        """Run action, re-resolving cached elements and retrying once if one went stale"""
+        try:
+            return action()
+        except StaleElementReferenceException:
+            self.logger.debug("Cached element went stale - re-resolving")
+            self._clear_element_cache()
+            return action()
+    
+    def fill_fields_batch(self, entries: list) -> list[int]:
+        """
+        Set many fields with a single script call
+        
+        Args:
+            entries: (css_selector, match_index, value, is_select) tuples;
+                     selects are matched by visible option text
+        
+        Returns:
+            Positions of entries that could not be set
+        """
+        return self.driver.execute_script(_BATCH_FILL_JS, [list(e) for e in entries])
+    
+    def select_by_text_js(self, element: WebElement, text: str):
+        """Select a dropdown option by visible text with a single script call"""
+        if not self.driver.execute_script(_SELECT_BY_TEXT_JS, element, text):
+            # Let Selenium do its own (whitespace-normalizing) match or raise
+            Select(element).select_by_visible_text(text)
+    
     def fill_text_field(self, field_name: str, value: str, required: bool = True):
         """Fill a text input field"""
         if not value and not required:
             return
         
+        use_cdp = self.config['browser'].get('use_cdp_input', True)
+        
+        def fill():
+            element = self._get(field_name)
+            if use_cdp:
+                # Insert the whole value at once instead of one keystroke per character
+                self.driver.execute_script(_FOCUS_AND_CLEAR_JS, element)
+                self.driver.execute_cdp_cmd('Input.insertText', {'text': value})
+                self.driver.execute_script(_FIRE_INPUT_EVENTS_JS, element)
+            else:
+                element.clear()
+                element.send_keys(value)
+        
         try:
-            selector = self.config['form_selectors'][field_name]
-            element = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-            )
-            element.clear()
-            element.send_keys(value)
-            self.logger.debug(f"Filled {field_name}: {value}")
+            self._retry_stale(fill)
+            self.logger.debug("Filled %s: %s", field_name, value)
         except Exception as e:
             self.logger.error(f"Error filling {field_name}: {e}")
             raise
@@ -203,221 +482,97 @@ class EgyptVisaFormAutomation:
     def select_dropdown(self, field_name: str, value: str, mapping_key: Optional[str] = None):
         """Select value from dropdown"""
         try:
-            selector = self.config['form_selectors'][field_name]
-            element = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-            )
-            
             # Use mapping if provided
             if mapping_key and mapping_key in self.config:
                 mapped_value = self.config[mapping_key].get(value, value)
             else:
                 mapped_value = value
             
-            select = Select(element)
-            select.select_by_visible_text(mapped_value)
-            self.logger.debug(f"Selected {field_name}: {mapped_value}")
+            self._retry_stale(
+                lambda: self.select_by_text_js(self._get(field_name), mapped_value)
+            )
+            self.logger.debug("Selected %s: %s", field_name, mapped_value)
         except Exception as e:
             self.logger.error(f"Error selecting {field_name}: {e}")
             raise
     
-    def fill_date_field(self, field_name: str, date_value: str):
+    def fill_date_field(self, field_name: str, date_obj: date):
         """Fill a date field (handles hidden inputs with JavaScript)"""
         try:
-            date_obj = datetime.strptime(date_value, '%Y-%m-%d')
-            formatted_date = date_obj.strftime('%Y-%m-%d')
+            formatted_date = date_obj.isoformat()
             
-            selector = self.config['form_selectors'][field_name]
-            element = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-            )
+            def fill():
+                element = self._get(field_name)
+                # Check if element is hidden - use JavaScript if so
+                if element.get_attribute('type') == 'hidden':
+                    self.driver.execute_script(
+                        f"arguments[0].value = '{formatted_date}';", 
+                        element
+                    )
+                    self.logger.debug("Filled hidden date %s using JavaScript: %s", field_name, formatted_date)
+                else:
+                    # Regular text input
+                    element.clear()
+                    element.send_keys(formatted_date)
+                    self.logger.debug("Filled %s: %s", field_name, formatted_date)
             
-            # Check if element is hidden - use JavaScript if so
-            if element.get_attribute('type') == 'hidden':
-                # Use JavaScript to set the value
-                self.driver.execute_script(
-                    f"arguments[0].value = '{formatted_date}';", 
-                    element
-                )
-                self.logger.debug(f"Filled hidden date {field_name} using JavaScript: {formatted_date}")
-            else:
-                # Regular text input
-                element.clear()
-                element.send_keys(formatted_date)
-                self.logger.debug(f"Filled {field_name}: {formatted_date}")
+            self._retry_stale(fill)
                 
-        except ValueError as e:
-            self.logger.error(f"Invalid date format for {field_name}: {date_value}")
-            raise
         except Exception as e:
             self.logger.error(f"Error filling date field {field_name}: {e}")
             raise
     
-    def fill_date_dropdowns(self, base_field_name: str, date_value: str):
-        """Fill date using separate month/day/year dropdowns"""
+    def _fill_birthday_by_name(self, base_field_name: str, date_obj: date):
+        """Select a date in the month/day/year dropdowns configured for a field"""
         try:
-            date_obj = datetime.strptime(date_value, '%Y-%m-%d')
-            
-            # Month mapping (English month names)
-            months = {
-                1: "يناير / January",
-                2: "فبراير / February",
-                3: "مارس / March",
-                4: "أبريل / April",
-                5: "مايو / May",
-                6: "يونيو / June",
-                7: "يوليو / July",
-                8: "أغسطس / August",
-                9: "سبتمبر / September",
-                10: "أكتوبر / October",
-                11: "نوفمبر / November",
-                12: "ديسمبر / December"
-            }
-            
-            # Fill month
-            month_selector = self.config['form_selectors'][f'{base_field_name}_month']
-            month_element = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, month_selector))
-            )
-            month_select = Select(month_element)
-            month_select.select_by_visible_text(months[date_obj.month])
-            self.logger.debug(f"Selected month: {months[date_obj.month]}")
-            
-            # Fill day
-            day_selector = self.config['form_selectors'][f'{base_field_name}_day']
-            day_element = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, day_selector))
-            )
-            day_select = Select(day_element)
-            day_select.select_by_visible_text(str(date_obj.day))
-            self.logger.debug(f"Selected day: {date_obj.day}")
+            def fill():
+                self.select_by_text_js(self._get(f'{base_field_name}_month'), _MONTHS[date_obj.month])
+                self.select_by_text_js(self._get(f'{base_field_name}_day'), str(date_obj.day))
+                self.select_by_text_js(self._get(f'{base_field_name}_year'), str(date_obj.year))
             
-            # Fill year
-            year_selector = self.config['form_selectors'][f'{base_field_name}_year']
-            year_element = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, year_selector))
-            )
-            year_select = Select(year_element)
-            year_select.select_by_visible_text(str(date_obj.year))
-            self.logger.debug(f"Selected year: {date_obj.year}")
+            self._retry_stale(fill)
+            self.logger.debug("Selected %s: %s", base_field_name, date_obj)
             
-        except ValueError as e:
-            self.logger.error(f"Invalid date format for {base_field_name}: {date_value}")
-            raise
         except Exception as e:
             self.logger.error(f"Error filling date dropdowns for {base_field_name}: {e}")
             raise
     
-    def fill_passport_date(self, field_name: str, date_value: str):
-        """Fill passport dates using dropdowns (they reuse birthday selector names)"""
+    def _fill_birthday_by_index(self, index: int, date_obj: date):
+        """Select a date in the index-th set of birthday[...] dropdowns"""
         try:
-            date_obj = datetime.strptime(date_value, '%Y-%m-%d')
+            values = (_MONTHS[date_obj.month], str(date_obj.day), str(date_obj.year))
             
-            # Month mapping
-            months = {
-                1: "يناير / January",
-                2: "فبراير / February",
-                3: "مارس / March",
-                4: "أبريل / April",
-                5: "مايو / May",
-                6: "يونيو / June",
-                7: "يوليو / July",
-                8: "أغسطس / August",
-                9: "سبتمبر / September",
-                10: "أكتوبر / October",
-                11: "نوفمبر / November",
-                12: "ديسمبر / December"
-            }
+            def fill():
+                dropdowns = zip(('month', 'day', 'year'), self._birthday_dropdowns(index), values)
+                for part, elements, value in dropdowns:
+                    # Month/day lists can be shorter than the year list; skip each on its own
+                    if len(elements) <= index:
+                        self.logger.warning(f"Date {part} dropdown {index} not found - skipping")
+                        continue
+                    self.select_by_text_js(elements[index], value)
             
-            # Get all dropdowns with name birthday[month], birthday[day], birthday[year]
-            # We need to use the correct index based on which date we're filling
-            # issued_on uses index 1 (second set), expires_on uses index 2 (third set)
-            
-            if field_name == 'issued_on':
-                dropdown_index = 1  # Second set of dropdowns
-            elif field_name == 'expires_on':
-                dropdown_index = 2  # Third set of dropdowns
-            else:
-                dropdown_index = 0
+            self._retry_stale(fill)
+            self.logger.debug("Selected date set %d: %s", index, date_obj)
             
-            # Find all month dropdowns
-            month_elements = self.driver.find_elements(By.CSS_SELECTOR, "select[name='birthday[month]']")
-            if len(month_elements) > dropdown_index:
-                month_select = Select(month_elements[dropdown_index])
-                month_select.select_by_visible_text(months[date_obj.month])
-                self.logger.debug(f"Selected {field_name} month: {months[date_obj.month]}")
+        except TimeoutException:
+            # The page has no such set of dropdowns - skip it like before
+            self.logger.warning(f"Date dropdown set {index} not found - skipping {date_obj}")
             
-            # Find all day dropdowns
-            day_elements = self.driver.find_elements(By.CSS_SELECTOR, "select[name='birthday[day]']")
-            if len(day_elements) > dropdown_index:
-                day_select = Select(day_elements[dropdown_index])
-                day_select.select_by_visible_text(str(date_obj.day))
-                self.logger.debug(f"Selected {field_name} day: {date_obj.day}")
-            
-            # Find all year dropdowns
-            year_elements = self.driver.find_elements(By.CSS_SELECTOR, "select[name='birthday[year]']")
-            if len(year_elements) > dropdown_index:
-                year_select = Select(year_elements[dropdown_index])
-                year_select.select_by_visible_text(str(date_obj.year))
-                self.logger.debug(f"Selected {field_name} year: {date_obj.year}")
-            
-        except ValueError as e:
-            self.logger.error(f"Invalid date format for {field_name}: {date_value}")
-            raise
         except Exception as e:
-            self.logger.error(f"Error filling passport date {field_name}: {e}")
+            self.logger.error(f"Error filling date dropdown set {index}: {e}")
             raise
     
-    def fill_arrival_date(self, date_value: str):
+    def fill_date_dropdowns(self, base_field_name: str, date_obj: date):
+        """Fill date using separate month/day/year dropdowns"""
+        self._fill_birthday_by_name(base_field_name, date_obj)
+    
+    def fill_passport_date(self, field_name: str, date_obj: date):
+        """Fill passport dates using dropdowns (they reuse birthday selector names)"""
+        self._fill_birthday_by_index(_BIRTHDAY_INDEX.get(field_name, 0), date_obj)
+    
+    def fill_arrival_date(self, date_obj: date):
         """Fill arrival date using dropdowns (4th set of birthday dropdowns)"""
-        try:
-            date_obj = datetime.strptime(date_value, '%Y-%m-%d')
-            
-            # Month mapping
-            months = {
-                1: "يناير / January",
-                2: "فبراير / February",
-                3: "مارس / March",
-                4: "أبريل / April",
-                5: "مايو / May",
-                6: "يونيو / June",
-                7: "يوليو / July",
-                8: "أغسطس / August",
-                9: "سبتمبر / September",
-                10: "أكتوبر / October",
-                11: "نوفمبر / November",
-                12: "ديسمبر / December"
-            }
-            
-            dropdown_index = 3  # Fourth set of dropdowns (0-based index)
-            
-            # Find all month dropdowns
-            month_elements = self.driver.find_elements(By.CSS_SELECTOR, "select[name='birthday[month]']")
-            if len(month_elements) > dropdown_index:
-                month_select = Select(month_elements[dropdown_index])
-                month_select.select_by_visible_text(months[date_obj.month])
-                self.logger.debug(f"Selected arrival month: {months[date_obj.month]}")
-            
-            # Find all day dropdowns
-            day_elements = self.driver.find_elements(By.CSS_SELECTOR, "select[name='birthday[day]']")
-            if len(day_elements) > dropdown_index:
-                day_select = Select(day_elements[dropdown_index])
-                day_select.select_by_visible_text(str(date_obj.day))
-                self.logger.debug(f"Selected arrival day: {date_obj.day}")
-            
-            # Find all year dropdowns
-            year_elements = self.driver.find_elements(By.CSS_SELECTOR, "select[name='birthday[year]']")
-            if len(year_elements) > dropdown_index:
-                year_select = Select(year_elements[dropdown_index])
-                year_select.select_by_visible_text(str(date_obj.year))
-                self.logger.debug(f"Selected arrival year: {date_obj.year}")
-            
-        except ValueError as e:
-            self.logger.error(f"Invalid date format for arrival date: {date_value}")
-            raise
-        except Exception as e:
-            self.logger.error(f"Error filling arrival date: {e}")
-            raise
+        self._fill_birthday_by_index(_BIRTHDAY_INDEX['date_of_arrival'], date_obj)
     
     def take_screenshot(self, name: str):
         """Take a screenshot"""
@@ -430,11 +585,11 @@ class EgyptVisaFormAutomation:
         return filepath
     
     def quit(self):
-        """Close the browser and cleanup"""
-        if self.driver:
+        """Close the browser and cleanup (pooled drivers are left to the pool)"""
+        if self.driver and self._owns_driver:
             self.logger.info("Closing browser...")
             self.driver.quit()
-            self.driver = None
+        self.driver = None
 
 
 class VisaFormFiller:
@@ -444,15 +599,20 @@ class VisaFormFiller:
         self.auto = automation
         self.logger = automation.logger
     
+    def _fill_text(self, app: VisaApplication, field: str):
+        """Fill a text field, skipping empty optional ones without touching the browser"""
+        self.auto.fill_text_field(field, getattr(app, field),
+                                  required=field not in OPTIONAL_TEXT_FIELDS)
+    
     def fill_personal_info(self, app: VisaApplication):
         """Fill personal information section"""
         self.logger.info("Filling personal information...")
         
-        self.auto.fill_text_field('first_name', app.first_name)
-        self.auto.fill_text_field('middle_name', app.middle_name)
-        self.auto.fill_text_field('family_name', app.family_name)
-        self.auto.fill_date_dropdowns('date_of_birth', app.date_of_birth)
-        self.auto.fill_text_field('place_of_birth', app.place_of_birth)
+        self._fill_text(app, 'first_name')
+        self._fill_text(app, 'middle_name')
+        self._fill_text(app, 'family_name')
+        self.auto.fill_date_dropdowns('date_of_birth', app.parsed_date('date_of_birth'))
+        self._fill_text(app, 'place_of_birth')
         self.auto.select_dropdown('sex', app.sex, 'sex_mapping')
         self.auto.select_dropdown('marital_status', app.marital_status, 'marital_status_mapping')
     
@@ -460,96 +620,196 @@ class VisaFormFiller:
         """Fill nationality information"""
         self.logger.info("Filling nationality information...")
         
-        self.auto.fill_text_field('present_nationality', app.present_nationality)
-        self.auto.fill_text_field('nationality_of_origin', app.nationality_of_origin)
+        self._fill_text(app, 'present_nationality')
+        self._fill_text(app, 'nationality_of_origin')
     
     def fill_occupation(self, app: VisaApplication):
         """Fill occupation information"""
         self.logger.info("Filling occupation...")
         
-        self.auto.fill_text_field('occupation_arabic', app.occupation_arabic)
+        self._fill_text(app, 'occupation_arabic')
     
     def fill_passport(self, app: VisaApplication):
         """Fill passport information"""
         self.logger.info("Filling passport information...")
         
-        self.auto.fill_text_field('passport_number', app.passport_number)
-        self.auto.fill_text_field('passport_type', app.passport_type)
-        self.auto.fill_text_field('issued_at', app.issued_at)
+        self._fill_text(app, 'passport_number')
+        self._fill_text(app, 'passport_type')
+        self._fill_text(app, 'issued_at')
         # Passport dates use dropdowns (not hidden fields)
         # Note: The form might reuse the same selectors, we'll need to target them differently
         self.logger.info("Filling passport issued date...")
-        self.auto.fill_passport_date('issued_on', app.issued_on)
+        self.auto.fill_passport_date('issued_on', app.parsed_date('issued_on'))
         self.logger.info("Filling passport expiry date...")
-        self.auto.fill_passport_date('expires_on', app.expires_on)
+        self.auto.fill_passport_date('expires_on', app.parsed_date('expires_on'))
     
     def fill_addresses(self, app: VisaApplication):
         """Fill address information"""
         self.logger.info("Filling addresses...")
         
-        self.auto.fill_text_field('permanent_address', app.permanent_address)
-        self.auto.fill_text_field('present_address', app.present_address)
+        self._fill_text(app, 'permanent_address')
+        self._fill_text(app, 'present_address')
     
     def fill_visa_details(self, app: VisaApplication):
         """Fill visa-specific information"""
         self.logger.info("Filling visa details...")
         
         self.auto.select_dropdown('visa_type', app.visa_type, 'visa_type_mapping')
-        self.auto.fill_text_field('duration_of_stay', app.duration_of_stay)
+        self._fill_text(app, 'duration_of_stay')
         # Date of arrival also uses dropdowns (4th set)
         self.logger.info("Filling arrival date...")
-        self.auto.fill_arrival_date(app.date_of_arrival)
-        self.auto.fill_text_field('purpose_of_visit', app.purpose_of_visit)
-        self.auto.fill_text_field('address_in_egypt', app.address_in_egypt)
-        self.auto.fill_text_field('port_of_entry', app.port_of_entry)
+        self.auto.fill_arrival_date(app.parsed_date('date_of_arrival'))
+        self._fill_text(app, 'purpose_of_visit')
+        self._fill_text(app, 'address_in_egypt')
+        self._fill_text(app, 'port_of_entry')
     
     def fill_contact(self, app: VisaApplication):
         """Fill contact information"""
         self.logger.info("Filling contact information...")
         
-        self.auto.fill_text_field('phone_number', app.phone_number)
+        self._fill_text(app, 'phone_number')
     
-    def fill_relatives(self, app: VisaApplication):
+    def fill_relatives(self, app: VisaApplication, first_filled: bool = False):
         """Fill relatives/friends in Egypt"""
         self.logger.info(f"Filling {len(app.relatives)} relative(s)...")
+        if not app.relatives:
+            return
         
-        for idx, relative in enumerate(app.relatives):
-            if idx == 0:
-                # First relative uses default fields
-                self.auto.fill_text_field('relative_name', relative.full_name)
-                self.auto.fill_text_field('relative_address', relative.address)
-            else:
-                # Additional relatives - click "Add another person" button
-                try:
-                    add_button_selector = self.auto.config['form_selectors']['add_relative_button']
-                    add_button = self.auto.wait.until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, add_button_selector))
-                    )
-                    add_button.click()
-                    time.sleep(1)  # Wait for new fields to appear
-                    
-                    # Fill the new fields (implementation depends on form structure)
-                    # This might need adjustment based on actual form behavior
-                    self.logger.warning("Multiple relatives feature needs form-specific implementation")
-                except Exception as e:
-                    self.logger.warning(f"Could not add relative {idx + 1}: {e}")
+        if not first_filled:
+            # First relative uses default fields
+            self.auto.fill_text_field('relative_name', app.relatives[0].full_name)
+            self.auto.fill_text_field('relative_address', app.relatives[0].address)
+        
+        # Additional relatives - click "Add another person" button
+        for idx in range(1, len(app.relatives)):
+            try:
+                add_button = self.auto.wait.until(
+                    EC.element_to_be_clickable(self.auto._locators['add_relative_button'])
+                )
+                count_before = len(self.auto.driver.find_elements(By.CSS_SELECTOR, RELATIVE_NAME_INPUTS))
+                add_button.click()
+                # Wait for the new relative's fields to appear
+                self.auto.wait.until(
+                    lambda d: len(d.find_elements(By.CSS_SELECTOR, RELATIVE_NAME_INPUTS)) > count_before
+                )
+                
+                # Fill the new fields (implementation depends on form structure)
+                # This might need adjustment based on actual form behavior
+                self.logger.warning("Multiple relatives feature needs form-specific implementation")
+            except Exception as e:
+                self.logger.warning(f"Could not add relative {idx + 1}: {e}")
+    
+    def _batch_units(self, app: VisaApplication) -> list[tuple]:
+        """
+        Describe the form as (name, batch entries, fallback) units in page order
+        
+        The fallback fills the unit through the regular per-field methods.
+        """
+        selectors = self.auto._sel
+        
+        def text(field, value):
+            return (field, [(selectors[field], 0, value, False)],
+                    lambda: self.auto.fill_text_field(field, value))
+        
+        def app_text(field):
+            value = getattr(app, field)
+            if not value and field in OPTIONAL_TEXT_FIELDS:
+                return None
+            return text(field, value)
+        
+        def select(field, value, mapping_key):
+            mapped = self.auto.config.get(mapping_key, {}).get(value, value)
+            return (field, [(selectors[field], 0, mapped, True)],
+                    lambda: self.auto.select_dropdown(field, value, mapping_key))
+        
+        def date_set(field, fallback):
+            index = _BIRTHDAY_INDEX[field]
+            date_obj = app.parsed_date(field)
+            if date_obj is None:
+                return (field, [], fallback)
+            return (field, [
+                (BIRTHDAY_MONTH, index, _MONTHS[date_obj.month], True),
+                (BIRTHDAY_DAY, index, str(date_obj.day), True),
+                (BIRTHDAY_YEAR, index, str(date_obj.year), True),
+            ], fallback)
+        
+        units = [
+            app_text('first_name'),
+            app_text('middle_name'),
+            app_text('family_name'),
+            date_set('date_of_birth',
+                     lambda: self.auto.fill_date_dropdowns('date_of_birth', app.parsed_date('date_of_birth'))),
+            app_text('place_of_birth'),
+            select('sex', app.sex, 'sex_mapping'),
+            select('marital_status', app.marital_status, 'marital_status_mapping'),
+            app_text('present_nationality'),
+            app_text('nationality_of_origin'),
+            app_text('occupation_arabic'),
+            app_text('passport_number'),
+            app_text('passport_type'),
+            app_text('issued_at'),
+            date_set('issued_on',
+                     lambda: self.auto.fill_passport_date('issued_on', app.parsed_date('issued_on'))),
+            date_set('expires_on',
+                     lambda: self.auto.fill_passport_date('expires_on', app.parsed_date('expires_on'))),
+            app_text('permanent_address'),
+            app_text('present_address'),
+            select('visa_type', app.visa_type, 'visa_type_mapping'),
+            app_text('duration_of_stay'),
+            date_set('date_of_arrival',
+                     lambda: self.auto.fill_arrival_date(app.parsed_date('date_of_arrival'))),
+            app_text('purpose_of_visit'),
+            app_text('address_in_egypt'),
+            app_text('port_of_entry'),
+            app_text('phone_number'),
+        ]
+        units = [unit for unit in units if unit is not None]
+        
+        # The first relative's row is always on the page
+        if app.relatives:
+            units.append(text('relative_name', app.relatives[0].full_name))
+            units.append(text('relative_address', app.relatives[0].address))
+        
+        return units
+    
+    def fill_form_batched(self, app: VisaApplication):
+        """Fill every field already on the page in one script call, falling back per field"""
+        units = self._batch_units(app)
+        entries, owners = [], []
+        for unit_idx, (_, unit_entries, _) in enumerate(units):
+            entries.extend(unit_entries)
+            owners.extend([unit_idx] * len(unit_entries))
+        
+        self.logger.info(f"Filling {len(entries)} form fields in one batch...")
+        failed = {owners[i] for i in self.auto.fill_fields_batch(entries)}
+        failed.update(idx for idx, (_, unit_entries, _) in enumerate(units) if not unit_entries)
+        
+        for unit_idx in sorted(failed):
+            name, _, fallback = units[unit_idx]
+            self.logger.warning(f"Batch fill could not set {name} - filling it directly")
+            fallback()
     
     def fill_complete_form(self, app: VisaApplication):
         """Fill the complete application form"""
-        self.logger.info("Starting form fill process...")
+        self.logger.info(f"Starting form fill process for {app.full_name}...")
         
         try:
-            self.fill_personal_info(app)
-            self.fill_nationality(app)
-            self.fill_occupation(app)
-            self.fill_passport(app)
-            self.fill_addresses(app)
-            self.fill_visa_details(app)
-            self.fill_contact(app)
-            self.fill_relatives(app)
+            if self.auto.config['browser'].get('batch_fill', True):
+                self.fill_form_batched(app)
+                self.fill_relatives(app, first_filled=True)
+            else:
+                self.fill_personal_info(app)
+                self.fill_nationality(app)
+                self.fill_occupation(app)
+                self.fill_passport(app)
+                self.fill_addresses(app)
+                self.fill_visa_details(app)
+                self.fill_contact(app)
+                self.fill_relatives(app)
             
             self.logger.info("Form filled successfully!")
-            self.auto.take_screenshot("form_completed")
+            if self.auto.config['output'].get('debug_screenshots', False):
+                self.auto.take_screenshot("form_completed")
             
         except Exception as e:
             self.logger.error(f"Error filling form: {e}")
@@ -562,28 +822,28 @@ if __name__ == "__main__":
     config_path = Path(__file__).parent / "config" / "config.json"
     sample_data = Path(__file__).parent / "data" / "sample_application.json"
     
-    automation = EgyptVisaFormAutomation(config_path)
+    # Load and validate application before starting the browser
+    app = VisaApplication.from_json_file(sample_data)
+    is_valid, errors = app.validate()
     
-    try:
-        automation.setup_driver()
-        automation.navigate_to_form()
+    if not is_valid:
+        print("Validation errors:")
+        for error in errors:
+            print(f"  - {error}")
+    else:
+        automation = EgyptVisaFormAutomation(config_path)
         
-        # Load and validate application
-        app = VisaApplication.from_json_file(sample_data)
-        is_valid, errors = app.validate()
-        
-        if not is_valid:
-            print("Validation errors:")
-            for error in errors:
-                print(f"  - {error}")
-        else:
+        try:
+            automation.setup_driver()
+            automation.navigate_to_form()
+            
             # Fill the form
             filler = VisaFormFiller(automation)
             filler.fill_complete_form(app)
             
             # Wait to see the result
             input("Press Enter to close browser...")
-    
-    finally:
-        automation.quit()
+        
+        finally:
+            automation.quit()
 
@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration for the Egypt Visa Form RPA webhook server
+"""
+
+import os
+import threading
+
+# Each worker owns its own pool of Chrome instances
+POOL_SIZE = int(os.environ.get('DRIVER_POOL_SIZE', 2))
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+
+# Threaded workers: one thread per pooled browser plus headroom so
+# /health keeps answering while every browser is busy
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', POOL_SIZE + 2))
+timeout = 300
+
+# Logging
+loglevel = os.environ.get('LOG_LEVEL', 'debug')
+accesslog = '-'
+errorlog = '-'
+
+
+def post_worker_init(worker):
+    """Warm up this worker's WebDriver pool without delaying readiness"""
+    from app import init_driver_pool
+    threading.Thread(target=init_driver_pool, daemon=True).start()
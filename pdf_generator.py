@@ -2,18 +2,21 @@
 PDF generation and export functionality for Egypt visa forms
 """
 
+import io
 import time
+import concurrent.futures
 import json
 import base64
 from pathlib import Path
 from datetime import datetime
 import logging
 import platform
+from typing import Optional
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import ScriptTimeoutException, TimeoutException, WebDriverException
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 
@@ -24,18 +27,193 @@ from PIL import Image
 # Optional QR verification dependencies
 QR_VERIFICATION_AVAILABLE = False
 try:
-    import cv2
-    import numpy as np
     from pyzbar.pyzbar import decode as decode_qr
     QR_VERIFICATION_AVAILABLE = True
 except ImportError:
     # QR verification will be disabled if these aren't available
     pass
 
+# QR decoding (PIL + zbar, both release the GIL) overlaps with the PDF export
+_QR_DECODE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=2,
+    thread_name_prefix='qr-decode'
+)
+
+# True once no XHR/fetch requests are pending. window.__activeReq is kept by
+# the hooks create_driver() registers; pages loaded without them fall back to
+# the document load state.
+_NETWORK_IDLE_JS = """
+    if (typeof window.__activeReq !== 'undefined') {
+        return window.__activeReq === 0;
+    }
+    return document.readyState === 'complete';
+"""
+
+# Finds the first visible QR image and describes it in one round trip
+_QR_IMAGE_INFO_JS = """
+    const visible = img => {
+        const rect = img.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 &&
+            getComputedStyle(img).visibility !== 'hidden';
+    };
+    
+    // Look for QR code images
+    let images = Array.from(document.querySelectorAll(
+        "img[src*='qr'], img[alt*='QR'], img[alt*='qr'], img.qr-code, #qrcode img, .qr-code img"));
+    
+    // Try any img inside elements with 'qr' in class/id
+    if (!images.length) {
+        images = Array.from(document.querySelectorAll("[class*='qr'] img, [id*='qr'] img"));
+    }
+    
+    // Last resort: visible, roughly square images (QR codes are usually square)
+    if (!images.length) {
+        images = Array.from(document.images).filter(img => {
+            const rect = img.getBoundingClientRect();
+            return visible(img) && Math.abs(rect.width - rect.height) < 50 && rect.width > 100;
+        });
+    }
+    
+    const img = images.find(visible);
+    if (!img) return null;
+    const rect = img.getBoundingClientRect();
+    return {
+        src: img.src,
+        id: img.id,
+        class: img.className,
+        width: Math.round(rect.width),
+        height: Math.round(rect.height),
+        alt: img.alt,
+        // Viewport position and pixel ratio, for cropping screenshots
+        x: rect.left,
+        y: rect.top,
+        pixel_ratio: window.devicePixelRatio || 1
+    };
+"""
+# True once the QR image has finished loading
+_QR_RENDERED_JS = """
+    const qr = document.querySelector(
+        "img[src*='qr'], img[alt*='QR'], img[alt*='qr'], img.qr-code, #qrcode img, .qr-code img, " +
+        "[class*='qr'] img, [id*='qr'] img");
+    return !!qr && qr.complete && qr.naturalWidth > 0;
+"""
+
+# Resolves after the next frame has been painted (two animation frames), or
+# after arguments[0] ms - rAF is throttled in background/occluded windows
+_NEXT_PAINT_JS = """
+    const done = arguments[arguments.length - 1];
+    let finished = false;
+    const finish = painted => { if (!finished) { finished = true; done(painted); } };
+    setTimeout(() => finish(false), arguments[0]);
+    requestAnimationFrame(() => requestAnimationFrame(() => finish(true)));
+"""
+
+# Longest wait_for_paint will wait for a frame, in milliseconds
+PAINT_WAIT_MS = 500
+
+# Document size and the document-space boxes of the form's page sections
+_PAGE_LAYOUT_JS = """
+    const body = document.body;
+    const doc = document.documentElement;
+    const pages = Array.from(document.querySelectorAll(".page, .form-page, [class*='page']"))
+        .map(el => el.getBoundingClientRect())
+        .filter(r => r.width > 0 && r.height > 0)
+        .map(r => [r.left + window.scrollX, r.top + window.scrollY, r.width, r.height]);
+    return {
+        width: Math.max(body.scrollWidth, doc.scrollWidth, doc.clientWidth),
+        height: Math.max(body.scrollHeight, body.offsetHeight,
+                         doc.clientHeight, doc.scrollHeight, doc.offsetHeight),
+        pages: pages
+    };
+"""
+
+_SCROLL_AND_CLICK_JS = "arguments[0].scrollIntoView({behavior: 'instant', block: 'center'}); arguments[0].click();"
+
+# Clicks Save in Chrome's print preview by walking its shadow roots directly;
+# returns the path used, or null while the preview is not ready
+_CLICK_PRINT_PREVIEW_SAVE_JS = """
+    let el = document.querySelector('print-preview-app');
+    for (const selector of ['#sidebar', 'print-preview-button-strip', '.action-button']) {
+        el = el && el.shadowRoot && el.shadowRoot.querySelector(selector);
+    }
+    if (!el || !/\\bsave\\b/i.test(el.textContent)) return null;
+    el.click();
+    return 'print-preview-app > #sidebar > print-preview-button-strip > .action-button';
+"""
+
+# Bytes requested per IO.read when streaming PDFs out of Chrome
+PDF_STREAM_CHUNK_SIZE = 1 << 20
+
+# CSS pixels kept around the QR image when cropping screenshots (zbar needs a
+# quiet zone around the code)
+QR_CROP_PADDING = 16
+
+# Returns [element, description, index] for the first visible candidate, or null.
+# Candidates are CSS selectors or {css, text} pairs matched case-insensitively
+# on text content ({css, text, word: true} only matches whole words).
+_FIND_CLICKABLE_JS = """
+    const [candidates, pierceShadow] = arguments;
+    const roots = [document];
+    if (pierceShadow) {
+        // Chrome's print preview nests its buttons inside shadow roots
+        for (let i = 0; i < roots.length; i++) {
+            roots[i].querySelectorAll('*').forEach(el => {
+                if (el.shadowRoot) roots.push(el.shadowRoot);
+            });
+        }
+    }
+    const visible = el => el.getClientRects().length > 0;
+    
+    for (const [index, candidate] of candidates.entries()) {
+        const css = typeof candidate === 'string' ? candidate : candidate.css;
+        const texts = typeof candidate === 'string' ? null : candidate.text.map(t => t.toLowerCase());
+        const hasText = candidate.word
+            ? (content, t) => new RegExp(`(^|[^a-z0-9_])${t}($|[^a-z0-9_])`).test(content)
+            : (content, t) => content.includes(t);
+        const matches = el => visible(el) && (texts === null ||
+            texts.some(t => hasText(el.textContent.toLowerCase(), t)));
+        for (const root of roots) {
+            const el = Array.from(root.querySelectorAll(css)).find(matches);
+            if (el) {
+                return [el, typeof candidate === 'string'
+                    ? css : `${css} with text '${candidate.text.join("' / '")}'`, index];
+            }
+        }
+    }
+    return null;
+"""
+
+# Candidates for _find_clickable, tried in order
+SUBMIT_BUTTON_SELECTORS = (
+    "button[type='submit']",
+    {'css': 'button', 'text': ['أنشاء و طباعة النموذج', 'Create and print']},
+    ".btn-primary",
+    "button.create-print"
+)
+
+# Exact selector based on user's HTML: <button class="print-btn cus-btn d-print-none">
+PRINT_BUTTON_SELECTORS = (
+    "button.print-btn.cus-btn.d-print-none",
+    "button.print-btn.cus-btn",
+    "button.print-btn",
+    ".print-btn",
+    {'css': 'button', 'text': ['طباعة النموذج']}
+)
+
+# Chrome print preview Save button (searched through shadow roots)
+SAVE_BUTTON_SELECTORS = (
+    {'css': 'cr-button.action-button', 'text': ['Save'], 'word': True},
+    {'css': 'button', 'text': ['Save'], 'word': True}
+)
+
 
 class PDFGenerator:
     """Handles PDF generation from completed visa forms"""
     
+    # Candidate that last matched, per remembered search name ('save'), so
+    # later runs in this process try it first
+    _preferred_candidate: dict[str, object] = {}
+    
     def __init__(self, driver, config: dict, logger: logging.Logger):
         self.driver = driver
         self.config = config
@@ -43,6 +221,15 @@ class PDFGenerator:
         self.output_dir = Path(config['output']['pdf_directory'])
         self.output_dir.mkdir(exist_ok=True)
         
+        # Diagnostic screenshots around submission (off unless debugging)
+        self.debug_screenshots = config['output'].get('debug_screenshots', False)
+        self.screenshot_dir = Path(config['output']['screenshot_directory'])
+        
+        # Background QR decode started after submission (see finish_qr_verification)
+        self.qr_verification: Optional[concurrent.futures.Future] = None
+        if self.debug_screenshots:
+            self.screenshot_dir.mkdir(exist_ok=True)
+        
         # QR settings from config
         self.qr_settings = config.get('qr_settings', {
             'wait_timeout': 30,
@@ -68,46 +255,24 @@ class PDFGenerator:
         self.logger.info(f"Waiting for network idle (timeout: {timeout}s)...")
         
         start_time = time.time()
-        poll_interval = 0.5
         
-        while time.time() - start_time < timeout:
+        def network_idle(driver):
             try:
-                # Check if there are any pending XHR/fetch requests
-                is_idle = self.driver.execute_script("""
-                    // Check if there are pending XHR requests
-                    if (typeof window.activeXHRCount !== 'undefined') {
-                        return window.activeXHRCount === 0;
-                    }
-                    
-                    // Alternative: Check performance entries for incomplete requests
-                    const resources = window.performance.getEntriesByType('resource');
-                    const pendingRequests = resources.filter(r => {
-                        return r.initiatorType === 'xmlhttprequest' && !r.responseEnd;
-                    });
-                    
-                    // Also check for ongoing fetch requests
-                    if (typeof window.activeFetchCount !== 'undefined') {
-                        return pendingRequests.length === 0 && window.activeFetchCount === 0;
-                    }
-                    
-                    return pendingRequests.length === 0;
-                """)
-                
-                if is_idle:
-                    elapsed = time.time() - start_time
-                    self.logger.info(f"✓ Network idle detected after {elapsed:.1f}s")
-                    return True
-                
-                time.sleep(poll_interval)
-                
-            except Exception as e:
+                return driver.execute_script(_NETWORK_IDLE_JS)
+            except WebDriverException as e:
                 self.logger.warning(f"Error checking network status: {e}")
                 # If we can't check, assume it's idle after a reasonable wait
-                if time.time() - start_time > timeout / 2:
-                    return True
+                return time.time() - start_time > timeout / 2
         
-        self.logger.warning(f"Network idle timeout after {timeout}s")
-        return False
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(network_idle)
+        except TimeoutException:
+            self.logger.warning(f"Network idle timeout after {timeout}s")
+            return False
+        
+        elapsed = time.time() - start_time
+        self.logger.info(f"✓ Network idle detected after {elapsed:.1f}s")
+        return True
     
     def get_qr_image_info(self) -> dict:
         """
@@ -117,41 +282,11 @@ class PDFGenerator:
             Dict with QR image details (src, id, timestamp, etc.) or None
         """
         try:
-            # Look for QR code images
-            qr_images = self.driver.find_elements(By.CSS_SELECTOR, 
-                "img[src*='qr'], img[alt*='QR'], img[alt*='qr'], img.qr-code, #qrcode img, .qr-code img")
-            
-            if not qr_images:
-                # Try to find any img inside elements with 'qr' in class/id
-                qr_containers = self.driver.find_elements(By.XPATH, 
-                    "//*[contains(@class, 'qr') or contains(@id, 'qr')]//img")
-                if qr_containers:
-                    qr_images = qr_containers
-            
-            if not qr_images:
-                # Last resort: find all images and filter by size (QR codes are usually square)
-                all_images = self.driver.find_elements(By.TAG_NAME, "img")
-                qr_images = [img for img in all_images if img.is_displayed() and 
-                           abs(img.size['width'] - img.size['height']) < 50 and 
-                           img.size['width'] > 100]
-            
-            if qr_images:
-                # Get the first visible QR image
-                for img in qr_images:
-                    if img.is_displayed():
-                        info = {
-                            'src': img.get_attribute('src'),
-                            'id': img.get_attribute('id'),
-                            'class': img.get_attribute('class'),
-                            'width': img.size['width'],
-                            'height': img.size['height'],
-                            'alt': img.get_attribute('alt'),
-                            'element': img
-                        }
-                        self.logger.debug(f"QR image found: {info['src'][:100] if info['src'] else 'No src'}...")
-                        return info
-            
-            return None
+            info = self.driver.execute_script(_QR_IMAGE_INFO_JS)
+            # Called on every QR poll - leave formatting to the logger
+            if info:
+                self.logger.debug("QR image found: %.100s...", info['src'] or 'No src')
+            return info
             
         except Exception as e:
             self.logger.error(f"Error getting QR image info: {e}")
@@ -177,69 +312,144 @@ class PDFGenerator:
         
         start_time = time.time()
         initial_src = initial_qr_info['src'] if initial_qr_info else None
+        current = {}
         
-        while time.time() - start_time < timeout:
-            try:
-                current_qr_info = self.get_qr_image_info()
-                
-                if current_qr_info:
-                    current_src = current_qr_info['src']
-                    
-                    # Check if QR source changed
-                    if initial_src and current_src and current_src != initial_src:
-                        elapsed = time.time() - start_time
-                        self.logger.info(f"✓ QR code updated after {elapsed:.1f}s")
-                        self.logger.debug(f"  Old src: {initial_src[:80]}...")
-                        self.logger.debug(f"  New src: {current_src[:80]}...")
-                        return True
-                    
-                    # If we don't have initial info, wait a bit then accept current QR
-                    if not initial_src and time.time() - start_time > 3:
-                        self.logger.info("QR code detected (no baseline for comparison)")
-                        return True
-                
-                time.sleep(poll_interval)
-                
-            except Exception as e:
-                self.logger.warning(f"Error checking QR update: {e}")
-                time.sleep(poll_interval)
+        def qr_updated(driver):
+            current_qr_info = self.get_qr_image_info()
+            if not current_qr_info:
+                return False
+            current['src'] = current_qr_info['src']
+            
+            # Check if QR source changed
+            if initial_src:
+                return bool(current['src']) and current['src'] != initial_src
+            
+            # If we don't have initial info, wait a bit then accept current QR
+            return time.time() - start_time > 3
         
-        elapsed = time.time() - start_time
-        self.logger.warning(f"QR update timeout after {elapsed:.1f}s")
-        return False
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=poll_interval).until(qr_updated)
+        except TimeoutException:
+            elapsed = time.time() - start_time
+            self.logger.warning(f"QR update timeout after {elapsed:.1f}s")
+            return False
+        
+        if initial_src:
+            elapsed = time.time() - start_time
+            self.logger.info(f"✓ QR code updated after {elapsed:.1f}s")
+            self.logger.debug("  Old src: %.80s...", initial_src)
+            self.logger.debug("  New src: %.80s...", current['src'])
+        else:
+            self.logger.info("QR code detected (no baseline for comparison)")
+        return True
+    
+    @staticmethod
+    def _qr_crop_box(qr_info: dict, image_size: tuple) -> Optional[tuple]:
+        """Screenshot region around the QR image, or None if it is off-screen"""
+        scale = qr_info.get('pixel_ratio', 1)
+        pad = QR_CROP_PADDING
+        left = max(0, int((qr_info['x'] - pad) * scale))
+        top = max(0, int((qr_info['y'] - pad) * scale))
+        right = min(image_size[0], int((qr_info['x'] + qr_info['width'] + pad) * scale))
+        bottom = min(image_size[1], int((qr_info['y'] + qr_info['height'] + pad) * scale))
+        if right <= left or bottom <= top:
+            return None
+        return left, top, right, bottom
     
-    def decode_qr_code(self, screenshot_path: Path = None) -> dict:
+    def wait_for_qr_rendered(self, timeout: float = 5) -> bool:
         """
-        Decode QR code from screenshot to verify data
+        Wait until the QR image has loaded and the page has been painted
         
-        Args:
-            screenshot_path: Path to screenshot, or None to capture current page
+        Returns:
+            True if the QR image loaded, False if timeout
+        """
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda driver: driver.execute_script(_QR_RENDERED_JS)
+            )
+            rendered = True
+        except TimeoutException:
+            rendered = False
+        self.wait_for_paint()
+        return rendered
+    
+    def wait_for_paint(self) -> bool:
+        """
+        Block until the browser has painted the current page (at most PAINT_WAIT_MS)
         
         Returns:
-            Dict with decoded data and status
+            True if a frame was painted, False if the wait ran out
         """
-        if not self.qr_settings['verification_enabled']:
-            return {'verified': False, 'reason': 'Verification disabled in config'}
+        try:
+            return bool(self.driver.execute_async_script(_NEXT_PAINT_JS, PAINT_WAIT_MS))
+        except (ScriptTimeoutException, TimeoutException):
+            self.logger.debug("Paint wait hit the script timeout - continuing")
+            return False
+    
+    def _fetch_qr_image(self, src: str) -> Optional[bytes]:
+        """Raw bytes of the QR image from its data: URI or the browser's cache"""
+        try:
+            if src.startswith('data:image/'):
+                header, data = src.split(',', 1)
+                if ';base64' in header:
+                    return base64.b64decode(data)
+                return None
+            
+            frame_id = self.driver.execute_cdp_cmd('Page.getFrameTree', {})['frameTree']['frame']['id']
+            resource = self.driver.execute_cdp_cmd('Page.getResourceContent', {'frameId': frame_id, 'url': src})
+            if resource.get('base64Encoded'):
+                return base64.b64decode(resource['content'])
+            return None
+        except Exception as e:
+            self.logger.debug(f"Could not fetch QR image directly: {e}")
+            return None
+    
+    @staticmethod
+    def _to_grayscale(image_bytes: bytes) -> Image.Image:
+        """Decode an image to 8-bit grayscale, flattening transparency onto white"""
+        img = Image.open(io.BytesIO(image_bytes))
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGBA')
+            background = Image.new('RGBA', img.size, 'white')
+            img = Image.alpha_composite(background, img)
+        return img.convert('L')
+    
+    def _decode_qr_images(self, image_bytes: Optional[bytes], screenshot_png: Optional[bytes],
+                          qr_info: Optional[dict]) -> dict:
+        """
+        Decode QR codes from already captured images (makes no browser calls,
+        so it can run off the Selenium thread)
         
-        if not QR_VERIFICATION_AVAILABLE:
-            return {'verified': False, 'reason': 'QR verification libraries not available (pyzbar/opencv not installed)'}
+        Args:
+            image_bytes: The QR image's own bytes, tried first
+            screenshot_png: PNG screenshot, scanned if the image bytes give nothing
+            qr_info: Result of get_qr_image_info(); its position limits the screenshot scan
         
+        Returns:
+            Dict with decoded data and status
+        """
         try:
-            # Capture screenshot if not provided
-            if not screenshot_path:
-                temp_screenshot = self.output_dir / f"temp_qr_verify_{int(time.time())}.png"
-                self.driver.save_screenshot(str(temp_screenshot))
-                screenshot_path = temp_screenshot
-            else:
-                temp_screenshot = None
+            decoded_objects = []
             
-            # Read image
-            img = cv2.imread(str(screenshot_path))
-            if img is None:
-                return {'verified': False, 'error': 'Could not read screenshot'}
+            # Decode the image the page already has
+            # (zbar scans 8-bit grayscale, so hand it raw luminance bytes)
+            if image_bytes:
+                try:
+                    qr_img = self._to_grayscale(image_bytes)
+                    decoded_objects = decode_qr((qr_img.tobytes(), qr_img.width, qr_img.height))
+                except Exception as e:
+                    self.logger.debug(f"Could not decode QR image bytes: {e}")
             
-            # Decode QR codes
-            decoded_objects = decode_qr(img)
+            if not decoded_objects and screenshot_png:
+                img = Image.open(io.BytesIO(screenshot_png)).convert('L')
+                
+                # Scan just the QR image when its position is known
+                box = self._qr_crop_box(qr_info, img.size) if qr_info and 'x' in qr_info else None
+                if box:
+                    crop = img.crop(box)
+                    decoded_objects = decode_qr((crop.tobytes(), crop.width, crop.height))
+                if not decoded_objects:
+                    decoded_objects = decode_qr((img.tobytes(), img.width, img.height))
             
             if decoded_objects:
                 qr_data = []
@@ -255,10 +465,6 @@ class PDFGenerator:
                     except Exception as e:
                         self.logger.warning(f"Could not decode QR data: {e}")
                 
-                # Clean up temp screenshot
-                if temp_screenshot and temp_screenshot.exists():
-                    temp_screenshot.unlink()
-                
                 return {
                     'verified': True,
                     'qr_count': len(qr_data),
@@ -267,23 +473,127 @@ class PDFGenerator:
             else:
                 self.logger.warning("⚠ No QR codes found in screenshot")
                 
-                # Clean up temp screenshot
-                if temp_screenshot and temp_screenshot.exists():
-                    temp_screenshot.unlink()
-                
                 return {'verified': False, 'reason': 'No QR codes detected in image'}
         
         except Exception as e:
             self.logger.error(f"Error decoding QR code: {e}")
             return {'verified': False, 'error': str(e)}
     
+    def decode_qr_code(self, screenshot_png: bytes = None, qr_info: dict = None) -> dict:
+        """
+        Decode QR code from the QR image itself, or from a screenshot
+        
+        Args:
+            screenshot_png: PNG screenshot bytes, or None to capture current page
+            qr_info: Result of get_qr_image_info(); its src is decoded directly
+                     and its position limits the screenshot scan
+        
+        Returns:
+            Dict with decoded data and status
+        """
+        if not self.qr_settings['verification_enabled']:
+            return {'verified': False, 'reason': 'Verification disabled in config'}
+        
+        if not QR_VERIFICATION_AVAILABLE:
+            return {'verified': False, 'reason': 'QR verification library not available (pyzbar not installed)'}
+        
+        try:
+            return self._decode_qr_images(*self._capture_qr_sources(screenshot_png, qr_info), qr_info)
+        
+        except Exception as e:
+            self.logger.error(f"Error decoding QR code: {e}")
+            return {'verified': False, 'error': str(e)}
+    
+    def _capture_qr_sources(self, screenshot_png: Optional[bytes], qr_info: Optional[dict]) -> tuple:
+        """
+        Collect everything _decode_qr_images needs from the browser: the QR
+        image's own bytes and a screenshot to fall back on if they don't decode
+        
+        Returns:
+            (image_bytes or None, screenshot_png)
+        """
+        image_bytes = self._fetch_qr_image(qr_info['src']) if qr_info and qr_info.get('src') else None
+        if screenshot_png is None:
+            screenshot_png = self.driver.get_screenshot_as_png()
+        return image_bytes, screenshot_png
+    
+    def start_qr_verification(self, screenshot_png: Optional[bytes], qr_info: dict) -> concurrent.futures.Future:
+        """
+        Capture the QR image now and decode it in the background, so PDF
+        generation can carry on meanwhile (see finish_qr_verification)
+        """
+        image_bytes, screenshot_png = self._capture_qr_sources(screenshot_png, qr_info)
+        return _QR_DECODE_EXECUTOR.submit(self._decode_qr_images, image_bytes, screenshot_png, qr_info)
+    
+    def finish_qr_verification(self, timeout: float = 10):
+        """Wait for a background QR verification started by click_create_and_print_button and log it"""
+        if self.qr_verification is None:
+            return
+        
+        try:
+            verification_result = self.qr_verification.result(timeout=timeout)
+        except Exception as e:
+            verification_result = {'verified': False, 'error': str(e) or type(e).__name__}
+        finally:
+            self.qr_verification = None
+        
+        if verification_result.get('verified'):
+            qr_count = verification_result.get('qr_count', 0)
+            self.logger.info(f"✅ QR code verified - {qr_count} QR code(s) decoded successfully")
+            
+            # Log decoded data (truncated for security)
+            for idx, qr in enumerate(verification_result.get('qr_data', [])):
+                data_preview = qr['data'][:150] + ('...' if len(qr['data']) > 150 else '')
+                self.logger.info(f"  QR {idx+1} type: {qr['type']}, data length: {len(qr['data'])} chars")
+                self.logger.debug(f"  QR {idx+1} data preview: {data_preview}")
+        else:
+            reason = verification_result.get('reason', verification_result.get('error', 'Unknown'))
+            self.logger.info(f"ℹ️  QR verification skipped: {reason}")
+            # Don't fail - QR might still be valid but verification failed
+    
+    def _find_clickable(self, name: str, candidates: tuple, pierce_shadow: bool = False,
+                        timeout: float = 0, remember: bool = False):
+        """
+        Find the first visible candidate element in one script call
+        
+        Args:
+            name: Identifies this search for remembering its last match
+            candidates: CSS selectors / {css, text} pairs, tried in order
+            pierce_shadow: Also search inside shadow roots
+            timeout: Keep retrying the whole search for up to this many seconds
+            remember: Try the last match first on later searches; only for
+                      candidates that are equally specific
+        
+        Returns:
+            (element, description) or (None, None)
+        """
+        preferred = self._preferred_candidate.get(name) if remember else None
+        ordered = tuple(candidates)
+        if preferred in ordered:
+            ordered = (preferred,) + tuple(c for c in ordered if c != preferred)
+        
+        def search(driver):
+            return driver.execute_script(_FIND_CLICKABLE_JS, ordered, pierce_shadow)
+        
+        try:
+            found = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(search) if timeout else search(self.driver)
+        except TimeoutException:
+            found = None
+        if not found:
+            return None, None
+        
+        element, description, index = found
+        if remember:
+            self._preferred_candidate[name] = ordered[index]
+        return element, description
+    
     def click_create_and_print_button(self):
         """Click the 'Create and print form' button and wait for QR code generation with intelligent detection"""
         self.logger.info("Looking for create and print button...")
         
         try:
             # Wait for the form to be ready
-            time.sleep(2)
+            self.wait_for_paint()
             
             # PHASE 1: Get initial QR state (before submission)
             self.logger.info("📸 Capturing initial page state...")
@@ -297,51 +607,26 @@ class PDFGenerator:
             self.logger.debug(f"Initial URL: {initial_url}")
             
             # Take diagnostic screenshot before submission
-            try:
-                screenshot_dir = Path(self.config['output']['screenshot_directory'])
-                screenshot_dir.mkdir(exist_ok=True)
+            if self.debug_screenshots:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                before_submit_path = screenshot_dir / f"before_submit_{timestamp}.png"
-                self.driver.save_screenshot(str(before_submit_path))
-                self.logger.debug(f"Screenshot saved: {before_submit_path}")
-            except Exception as e:
-                self.logger.warning(f"Could not save before-submit screenshot: {e}")
-            
-            # PHASE 2: Find and click submit button
-            possible_selectors = [
-                "button[type='submit']",
-                "button:contains('أنشاء و طباعة النموذج')",
-                "button:contains('Create and print')",
-                ".btn-primary",
-                "button.create-print"
-            ]
-            
-            button = None
-            for selector in possible_selectors:
                 try:
-                    if ':contains' in selector:
-                        # Use XPath for text-based search
-                        xpath = f"//button[contains(text(), 'أنشاء و طباعة النموذج') or contains(text(), 'Create and print')]"
-                        button = self.driver.find_element(By.XPATH, xpath)
-                    else:
-                        button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    
-                    if button and button.is_displayed():
-                        self.logger.info(f"✓ Submit button found with selector: {selector}")
-                        break
-                except:
-                    continue
+                    before_submit_path = self.screenshot_dir / f"before_submit_{timestamp}.png"
+                    self.driver.save_screenshot(str(before_submit_path))
+                    self.logger.debug(f"Screenshot saved: {before_submit_path}")
+                except Exception as e:
+                    self.logger.warning(f"Could not save before-submit screenshot: {e}")
             
-            if not button:
+            # PHASE 2: Find and click submit button
+            button, selector = self._find_clickable('submit', SUBMIT_BUTTON_SELECTORS, timeout=3)
+            if button:
+                self.logger.info(f"✓ Submit button found with selector: {selector}")
+            else:
                 self.logger.error("❌ Create and print button not found")
                 return False
             
-            # Scroll into view and click
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
-            time.sleep(1)
-            
+            # Scroll into view and click in one round trip
             click_time = time.time()
-            button.click()
+            self.driver.execute_script(_SCROLL_AND_CLICK_JS, button)
             self.logger.info("✓ Create and print button clicked")
             
             # PHASE 3: Wait for network activity to complete
@@ -357,14 +642,20 @@ class PDFGenerator:
             self.logger.info("⏳ Waiting for QR code generation...")
             qr_updated = self.wait_for_qr_update(initial_qr_info)
             
-            # Additional wait after QR appears to ensure it's fully rendered
+            # Make sure the QR image is fully loaded and painted
             if qr_updated:
-                self.logger.info("⏳ Allowing extra time for QR rendering...")
-                time.sleep(3)
+                self.logger.info("⏳ Waiting for QR rendering...")
             else:
-                # If update detection failed, use fallback timing
-                self.logger.warning("⚠ QR update detection inconclusive - using fallback wait")
-                time.sleep(5)
+                self.logger.warning("⚠ QR update detection inconclusive - waiting for QR image to load")
+            self.wait_for_qr_rendered()
+            
+            # Capture the after-submit screenshot once so QR verification can reuse it
+            after_submit_png = None
+            if self.debug_screenshots:
+                try:
+                    after_submit_png = self.driver.get_screenshot_as_png()
+                except Exception as e:
+                    self.logger.warning(f"Could not capture after-submit screenshot: {e}")
             
             # PHASE 5: Verify QR code presence and optionally decode
             final_qr_info = self.get_qr_image_info()
@@ -379,34 +670,24 @@ class PDFGenerator:
                 # Verify QR contains data (if enabled and libraries available)
                 if self.qr_settings['verification_enabled']:
                     if QR_VERIFICATION_AVAILABLE:
-                        self.logger.info("🔍 Verifying QR code data...")
-                        verification_result = self.decode_qr_code()
-                        
-                        if verification_result.get('verified'):
-                            qr_count = verification_result.get('qr_count', 0)
-                            self.logger.info(f"✅ QR code verified - {qr_count} QR code(s) decoded successfully")
-                            
-                            # Log decoded data (truncated for security)
-                            for idx, qr in enumerate(verification_result.get('qr_data', [])):
-                                data_preview = qr['data'][:150] + ('...' if len(qr['data']) > 150 else '')
-                                self.logger.info(f"  QR {idx+1} type: {qr['type']}, data length: {len(qr['data'])} chars")
-                                self.logger.debug(f"  QR {idx+1} data preview: {data_preview}")
-                        else:
-                            reason = verification_result.get('reason', verification_result.get('error', 'Unknown'))
-                            self.logger.info(f"ℹ️  QR verification skipped: {reason}")
-                            # Don't fail - QR might still be valid but verification failed
+                        self.logger.info("🔍 Verifying QR code data in the background...")
+                        try:
+                            self.qr_verification = self.start_qr_verification(after_submit_png, final_qr_info)
+                        except Exception as e:
+                            self.logger.info(f"ℹ️  QR verification skipped: {e}")
                     else:
-                        self.logger.info("ℹ️  QR verification skipped (pyzbar/opencv not installed - see INSTALL_NEW_DEPENDENCIES.md)")
+                        self.logger.info("ℹ️  QR verification skipped (pyzbar not installed - see INSTALL_NEW_DEPENDENCIES.md)")
             else:
                 self.logger.warning("⚠ QR code not detected after submission")
             
             # PHASE 6: Take diagnostic screenshot after submission
-            try:
-                after_submit_path = screenshot_dir / f"after_submit_{timestamp}.png"
-                self.driver.save_screenshot(str(after_submit_path))
-                self.logger.debug(f"Screenshot saved: {after_submit_path}")
-            except Exception as e:
-                self.logger.warning(f"Could not save after-submit screenshot: {e}")
+            if after_submit_png:
+                try:
+                    after_submit_path = self.screenshot_dir / f"after_submit_{timestamp}.png"
+                    after_submit_path.write_bytes(after_submit_png)
+                    self.logger.debug(f"Screenshot saved: {after_submit_path}")
+                except Exception as e:
+                    self.logger.warning(f"Could not save after-submit screenshot: {e}")
             
             # Check if URL changed
             final_url = self.driver.current_url
@@ -436,13 +717,14 @@ class PDFGenerator:
         try:
             pdf_path = self.output_dir / filename
             
-            # Extra wait to ensure QR code and all content is fully rendered
+            # Make sure the QR code and all content is fully rendered
             self.logger.info("Waiting for complete form rendering (including QR code)...")
-            time.sleep(5)
+            if not self.wait_for_qr_rendered():
+                self.logger.warning("QR image not loaded - printing anyway")
             
             # Scroll to top to ensure proper rendering
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
+            self.wait_for_paint()
             
             # Use Chrome DevTools Protocol to print to PDF with optimized settings
             # Settings optimized to capture full page width and high-quality QR codes
@@ -458,17 +740,13 @@ class PDFGenerator:
                 "preferCSSPageSize": False,  # Don't use CSS page size (can cause issues)
                 "displayHeaderFooter": False,
                 "scale": 1.0,            # 100% scale for clarity
-                "transferMode": "ReturnAsBase64",
+                "transferMode": "ReturnAsStream",
                 "generateTaggedPDF": False,
                 "generateDocumentOutline": False
             })
             
-            # Decode the base64 PDF data
-            pdf_data = base64.b64decode(result['data'])
-            
-            # Write to file
-            with open(pdf_path, 'wb') as f:
-                f.write(pdf_data)
+            # Read the PDF stream in chunks and write it out as it arrives
+            self._write_cdp_stream(result['stream'], pdf_path)
             
             # Check if PDF was created successfully
             if pdf_path.exists() and pdf_path.stat().st_size > 0:
@@ -484,6 +762,19 @@ class PDFGenerator:
             self.logger.info("Attempting fallback screenshot method...")
             return self._generate_screenshot_fallback(filename)
     
+    def _write_cdp_stream(self, handle: str, path: Path):
+        """Copy a DevTools IO stream to a file chunk by chunk, then close it"""
+        try:
+            with path.open('wb') as f:
+                while True:
+                    chunk = self.driver.execute_cdp_cmd("IO.read", {"handle": handle, "size": PDF_STREAM_CHUNK_SIZE})
+                    data = chunk.get('data', '')
+                    f.write(base64.b64decode(data) if chunk.get('base64Encoded') else data.encode())
+                    if chunk.get('eof'):
+                        break
+        finally:
+            self.driver.execute_cdp_cmd("IO.close", {"handle": handle})
+    
     def _generate_screenshot_fallback(self, filename: str) -> Path:
         """
         Fallback method: capture all pages and convert to multi-page PDF
@@ -493,94 +784,65 @@ class PDFGenerator:
             # The form might be split into multiple divs/sections
             self.logger.info("Capturing multi-page form...")
             
-            # Scroll to top first
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
-            
-            # Get all form pages/sections
-            pages = []
-            
-            # Try to find page breaks or form sections
-            page_elements = self.driver.find_elements(By.CSS_SELECTOR, ".page, .form-page, [class*='page']")
+            # One beyond-viewport capture of the whole document; pages are cut
+            # from it in memory instead of scrolling and re-capturing
+            layout = self.driver.execute_script(_PAGE_LAYOUT_JS)
+            shot = self.driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "png",
+                "captureBeyondViewport": True,
+                "clip": {"x": 0, "y": 0, "width": layout['width'], "height": layout['height'], "scale": 1}
+            })
+            full_page = Image.open(io.BytesIO(base64.b64decode(shot['data'])))
+            scale = full_page.width / layout['width']
             
-            if not page_elements:
-                # No explicit pages found, capture the whole form in sections
-                # Get total height
-                total_height = self.driver.execute_script(
-                    "return Math.max( document.body.scrollHeight, document.body.offsetHeight, "
-                    "document.documentElement.clientHeight, document.documentElement.scrollHeight, "
-                    "document.documentElement.offsetHeight );"
-                )
-                
+            if layout['pages']:
+                # Cut out each explicit page element
+                self.logger.info(f"Found {len(layout['pages'])} form pages")
+                boxes = [(x, y, x + w, y + h) for x, y, w, h in layout['pages']]
+            else:
+                # No explicit pages found, cut the whole form in sections
                 # A4 height at 1200px width is approximately 1697px
-                # Capture in A4-sized chunks to simulate pages
+                total_height = layout['height']
                 page_height = 1697
-                num_pages = (total_height // page_height) + 1
-                
-                self.logger.info(f"Capturing {num_pages} page(s) from form (total height: {total_height}px)")
-                
-                for page_num in range(num_pages):
-                    # Scroll to the page
-                    scroll_y = page_num * page_height
-                    self.driver.execute_script(f"window.scrollTo(0, {scroll_y});")
-                    time.sleep(0.5)
-                    
-                    # Set window to capture this section
-                    self.driver.set_window_size(1200, min(page_height, total_height - scroll_y))
-                    time.sleep(0.5)
-                    
-                    # Take screenshot
-                    page_filename = f"page_{page_num + 1}.png"
-                    page_path = self.output_dir / page_filename
-                    self.driver.save_screenshot(str(page_path))
-                    pages.append(page_path)
-                    self.logger.info(f"✓ Captured page {page_num + 1}/{num_pages}")
-            else:
-                # Capture each explicit page element
-                self.logger.info(f"Found {len(page_elements)} form pages")
-                for idx, page_elem in enumerate(page_elements):
-                    # Scroll element into view
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", page_elem)
-                    time.sleep(0.5)
-                    
-                    # Take screenshot
-                    page_filename = f"page_{idx + 1}.png"
-                    page_path = self.output_dir / page_filename
-                    self.driver.save_screenshot(str(page_path))
-                    pages.append(page_path)
-                    self.logger.info(f"✓ Captured page {idx + 1}/{len(page_elements)}")
+                boxes = [
+                    (0, top, layout['width'], min(top + page_height, total_height))
+                    for top in range(0, total_height, page_height)
+                ]
+                self.logger.info(f"Capturing {len(boxes)} page(s) from form (total height: {total_height}px)")
+            
+            pages = []
+            for idx, box in enumerate(boxes):
+                buffer = io.BytesIO()
+                full_page.crop(tuple(round(v * scale) for v in box)).save(buffer, format='PNG')
+                pages.append(buffer.getvalue())
+                self.logger.info(f"✓ Captured page {idx + 1}/{len(boxes)}")
+            
+            # Free the full-page bitmap before the PDF is assembled
+            full_page.close()
+            del shot
             
             # Convert all pages to a single multi-page PDF
             pdf_path = self.output_dir / filename
             
             try:
-                # Read all page images
-                page_data = []
-                for page_path in pages:
-                    with open(page_path, 'rb') as f:
-                        page_data.append(f.read())
-                
-                # Convert all pages to PDF
-                pdf_bytes = img2pdf.convert(page_data)
-                
-                # Write PDF
-                with open(pdf_path, 'wb') as f:
-                    f.write(pdf_bytes)
+                # Convert all pages to PDF, streaming it straight into the file
+                with pdf_path.open('wb') as pdf_file:
+                    img2pdf.convert(pages, outputstream=pdf_file)
                 
                 self.logger.info(f"✓ Created {len(pages)}-page PDF: {pdf_path}")
-                
-                # Clean up temporary PNG files
-                for page_path in pages:
-                    page_path.unlink()
-                self.logger.debug(f"Cleaned up {len(pages)} temporary PNG file(s)")
-                
                 return pdf_path
                 
             except Exception as conv_error:
                 self.logger.error(f"Error converting pages to PDF: {conv_error}")
+                pdf_path.unlink(missing_ok=True)
                 # Keep the PNG files if conversion fails
                 self.logger.info(f"Keeping {len(pages)} PNG file(s)")
-                return pages[0] if pages else None
+                page_paths = []
+                for idx, png in enumerate(pages):
+                    page_path = self.output_dir / f"page_{idx + 1}.png"
+                    page_path.write_bytes(png)
+                    page_paths.append(page_path)
+                return page_paths[0] if page_paths else None
         
         except Exception as e:
             self.logger.error(f"Multi-page capture failed: {e}")
@@ -604,45 +866,23 @@ class PDFGenerator:
         try:
             self.logger.info("Looking for print button (طباعة النموذج)...")
             
-            # Wait a moment for the button to appear after form generation
-            time.sleep(2)
-            
-            # Exact selector based on user's HTML: <button class="print-btn cus-btn d-print-none">
-            print_button_selectors = [
-                "button.print-btn.cus-btn.d-print-none",
-                "button.print-btn.cus-btn",
-                "button.print-btn",
-                ".print-btn",
-                "//button[contains(@class, 'print-btn') and contains(text(), 'طباعة')]",
-                "//button[contains(text(), 'طباعة النموذج')]"
-            ]
+            # Wait for the button to appear after form generation
+            try:
+                WebDriverWait(self.driver, self.config['timeouts']['element_wait']).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ".print-btn"))
+                )
+            except TimeoutException:
+                self.logger.warning("Print button did not appear - trying fallback selectors")
             
-            for selector in print_button_selectors:
-                try:
-                    if selector.startswith('//'):
-                        # XPath selector
-                        button = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        # CSS selector
-                        button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    
-                    # Check if found and visible
-                    if button and button.is_displayed():
-                        self.logger.info(f"✓ Found print button with selector: {selector}")
-                        
-                        # Scroll into view
-                        self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", button)
-                        time.sleep(0.5)
-                        
-                        # Click using JavaScript for reliability
-                        self.driver.execute_script("arguments[0].click();", button)
-                        self.logger.info("✓ Print button clicked - Chrome print preview should open")
-                        
-                        return True
-                        
-                except Exception as e:
-                    self.logger.debug(f"Selector '{selector}' failed: {str(e)[:100]}")
-                    continue
+            button, selector = self._find_clickable('print', PRINT_BUTTON_SELECTORS)
+            if button:
+                self.logger.info(f"✓ Found print button with selector: {selector}")
+                
+                # Scroll into view and click using JavaScript for reliability
+                self.driver.execute_script(_SCROLL_AND_CLICK_JS, button)
+                self.logger.info("✓ Print button clicked - Chrome print preview should open")
+                
+                return True
             
             self.logger.warning("⚠️  Print button not found with any selector")
             return False
@@ -664,50 +904,32 @@ class PDFGenerator:
         try:
             self.logger.info("Looking for Save button in Chrome print preview...")
             
-            # Wait for print preview to fully load
-            time.sleep(2)
-            
-            # Chrome print preview Save button selectors
-            save_button_selectors = [
-                "//cr-button[@class='action-button' and contains(text(), 'Save')]",
-                "//button[contains(text(), 'Save')]",
-                "cr-button.action-button",
-                "#sidebar button.action-button",
-                "print-preview-button-strip cr-button.action-button",
-                "//cr-button[contains(@class, 'action-button')]"
-            ]
+            # Wait for print preview to load, then click Save through its known
+            # shadow DOM path in the same script call
+            try:
+                path = WebDriverWait(self.driver, 5, poll_frequency=0.2).until(
+                    lambda driver: driver.execute_script(_CLICK_PRINT_PREVIEW_SAVE_JS)
+                )
+                self.logger.info(f"✓ Save button clicked via {path}")
+                return True
+            except TimeoutException:
+                self.logger.debug("Save button not at its usual shadow DOM path")
             
-            for selector in save_button_selectors:
+            # Other Chrome versions: search every shadow root for the button
+            save_button, selector = self._find_clickable('save', SAVE_BUTTON_SELECTORS, pierce_shadow=True, remember=True)
+            if save_button:
+                self.logger.info(f"✓ Found Save button with selector: {selector}")
+                
+                # Move to and click the Save button in one W3C actions request
                 try:
-                    if selector.startswith('//'):
-                        # XPath selector
-                        save_button = self.driver.find_element(By.XPATH, selector)
-                    else:
-                        # CSS selector  
-                        save_button = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    
-                    if save_button:
-                        # Get button text to confirm it's the Save button
-                        button_text = save_button.text.strip()
-                        self.logger.info(f"Found button with text: '{button_text}'")
-                        
-                        if 'save' in button_text.lower():
-                            self.logger.info(f"✓ Found Save button with selector: {selector}")
-                            
-                            # Click the Save button
-                            try:
-                                save_button.click()
-                                self.logger.info("✓ Save button clicked successfully")
-                            except:
-                                # Try JavaScript click
-                                self.driver.execute_script("arguments[0].click();", save_button)
-                                self.logger.info("✓ Save button clicked (JavaScript)")
-                            
-                            return True
-                            
-                except Exception as e:
-                    self.logger.debug(f"Save button selector '{selector}' failed: {str(e)[:100]}")
-                    continue
+                    ActionChains(self.driver).move_to_element(save_button).click().perform()
+                    self.logger.info("✓ Save button clicked successfully")
+                except:
+                    # Try JavaScript click
+                    self.driver.execute_script("arguments[0].click();", save_button)
+                    self.logger.info("✓ Save button clicked (JavaScript)")
+                
+                return True
             
             # Fallback: use keyboard shortcut (Enter key to save)
             self.logger.info("Save button not found - using Enter key shortcut...")
@@ -721,6 +943,23 @@ class PDFGenerator:
             self.logger.error(f"Error clicking Save button: {e}")
             return False
     
+    def _find_form_window(self, original_window: str) -> Optional[dict]:
+        """
+        Find a tab other than the original one that shows a web page
+        
+        ChromeDriver window handles are DevTools target ids, so one
+        Target.getTargets call lists every tab with its URL.
+        
+        Returns:
+            Target info dict (targetId, url, ...) or None
+        """
+        targets = self.driver.execute_cdp_cmd("Target.getTargets", {})['targetInfos']
+        for target in targets:
+            if (target['type'] == 'page' and target['targetId'] != original_window
+                    and not target['url'].startswith(('chrome://', 'devtools://'))):
+                return target
+        return None
+    
     def save_form_as_pdf(self, filename: str, click_print: bool = True) -> Path:
         """
         Complete workflow to save the filled form as PDF using native print
@@ -736,16 +975,19 @@ class PDFGenerator:
         
         # Check if a new window opened (form preview with QR code)
         original_window = self.driver.current_window_handle
-        all_windows = self.driver.window_handles
+        new_window = self._find_form_window(original_window)
         
-        if len(all_windows) > 1:
+        if new_window:
             # Switch to the new window (the one with the generated form + QR)
-            for window in all_windows:
-                if window != original_window:
-                    self.driver.switch_to.window(window)
-                    self.logger.info("✓ Switched to new window with generated form")
-                    break
-            time.sleep(2)  # Let the new window fully load
+            self.driver.switch_to.window(new_window['targetId'])
+            self.logger.info(f"✓ Switched to new window with generated form: {new_window['url'][:80]}")
+            # Let the new window fully load
+            try:
+                WebDriverWait(self.driver, self.config['timeouts']['element_wait']).until(
+                    lambda driver: driver.execute_script("return document.readyState") == 'complete'
+                )
+            except TimeoutException:
+                self.logger.warning("New window still loading - continuing")
         else:
             self.logger.info("Form displayed in same window")
         
@@ -753,7 +995,6 @@ class PDFGenerator:
         # The print button triggers Chrome's native print dialog which can't be automated reliably
         # CDP gives us full control and better rendering
         self.logger.info("ℹ️  Using optimized CDP method (avoids popup, better quality)")
-        time.sleep(2)
         
         # Generate PDF directly using CDP with optimized settings
         pdf_path = self.generate_pdf_via_print(filename)
@@ -780,24 +1021,29 @@ def create_pdf_from_filled_form(automation, application, click_create_button: bo
     Returns:
         Path to generated PDF
     """
+    # PDFGenerator creates the output directory, so the save step only writes
     pdf_gen = PDFGenerator(
         automation.driver,
         automation.config,
         automation.logger
     )
     
+    # Generate filename before the slow browser steps
+    filename = application.get_output_filename()
+    automation.logger.info(f"PDF will be saved as {pdf_gen.output_dir / filename}")
+    
     # Click create and print button
     if click_create_button:
         success = pdf_gen.click_create_and_print_button()
         if not success:
             automation.logger.warning("Could not click create button, attempting PDF generation anyway")
     
-    # Generate filename
-    filename = application.get_output_filename()
-    
     # Save as PDF (click_print=True to click the second print button)
     pdf_path = pdf_gen.save_form_as_pdf(filename, click_print=True)
     
+    # QR verification ran alongside the PDF export; report its outcome
+    pdf_gen.finish_qr_verification()
+    
     return pdf_path
 
 
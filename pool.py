@@ -0,0 +1,158 @@
+"""
+Pool of pre-warmed Chrome WebDriver instances shared across form runs
+"""
+
+import itertools
+import logging
+import queue
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+
+from form_automation import EgyptVisaFormAutomation
+
+
+class ChromeDriverPool:
+    """Hands out ready Chrome drivers and recycles them after max_uses"""
+    
+    def __init__(self, config: dict, size: int = 4, max_uses: int = 50,
+                 start_url: str = 'about:blank', prewarm: bool = True):
+        """
+        Args:
+            config: Parsed automation config (same as EgyptVisaFormAutomation)
+            size: Number of drivers kept in the pool
+            max_uses: Runs served by a driver before it is rebuilt
+            start_url: Page released drivers are parked on
+            prewarm: Launch every driver in start(); otherwise each slot
+                     launches Chrome on its first acquire
+        """
+        self.config = config
+        self.size = size
+        self.max_uses = max_uses
+        self.start_url = start_url
+        self.prewarm = prewarm
+        self.logger = logging.getLogger('ChromeDriverPool')
+        
+        # None marks a slot whose driver is built on the next acquire
+        self._drivers: queue.Queue = queue.Queue(maxsize=size)
+        # Use counts keyed by the token _build stamps on each driver (ids get reused)
+        self._uses: dict[int, int] = {}
+        self._tokens = itertools.count()
+        self._uses_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._started = False
+    
+    def _build(self) -> webdriver.Chrome:
+        """Launch a new driver with the same options as setup_driver"""
+        driver = EgyptVisaFormAutomation.from_config(self.config).create_driver()
+        driver.get(self.start_url)
+        driver._pool_token = next(self._tokens)
+        with self._uses_lock:
+            self._uses[driver._pool_token] = 0
+        return driver
+    
+    def _build_or_none(self) -> Optional[webdriver.Chrome]:
+        """Launch a driver, leaving the slot cold if Chrome fails to start"""
+        try:
+            return self._build()
+        except Exception as e:
+            self.logger.warning(f"Could not pre-warm WebDriver: {e}")
+            return None
+    
+    def start(self):
+        """Fill the pool with pre-warmed (or empty, launched on demand) slots once"""
+        # Claim the start under the lock but launch Chrome outside it, so
+        # acquire() during warmup only waits on the queue (its own timeout)
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        
+        if not self.prewarm:
+            for _ in range(self.size):
+                self._drivers.put(None)
+            return
+        
+        self.logger.info(f"Warming up WebDriver pool ({self.size} instance(s))...")
+        for _ in range(self.size):
+            self._drivers.put(self._build_or_none())
+    
+    def acquire(self, timeout: Optional[float] = None) -> webdriver.Chrome:
+        """Borrow a driver (raises queue.Empty if none frees up within timeout)"""
+        if not self._started:
+            # Warm up in the background so this call only waits up to timeout
+            threading.Thread(target=self.start, daemon=True).start()
+        driver = self._drivers.get(timeout=timeout)
+        if driver is None:
+            try:
+                driver = self._build()
+            except Exception:
+                self._drivers.put(None)
+                raise
+        with self._uses_lock:
+            self._uses[driver._pool_token] = self._uses.get(driver._pool_token, 0) + 1
+        return driver
+    
+    def release(self, driver: webdriver.Chrome, failed: bool = False):
+        """Return a driver with a clean context, or rebuild it if worn out or broken"""
+        with self._uses_lock:
+            uses = self._uses.get(driver._pool_token, 0)
+        if not failed and uses < self.max_uses:
+            try:
+                self._clean(driver)
+                self._drivers.put(driver)
+                return
+            except Exception as e:
+                self.logger.warning(f"Could not reset WebDriver, recycling it: {e}")
+        
+        with self._uses_lock:
+            self._uses.pop(driver._pool_token, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self._drivers.put(self._build_or_none())
+    
+    def _clean(self, driver: webdriver.Chrome):
+        """Drop windows, cookies, site storage and cache left over from the previous run"""
+        handles = driver.window_handles
+        if len(handles) > 1:
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+        
+        # sessionStorage is per tab, so clear it from the page itself
+        driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        
+        # Cookies for every domain, plus storage of the origins the applicant visited
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        origins = {self._origin(driver.current_url), self._origin(self.start_url)}
+        for origin in filter(None, origins):
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        driver.get(self.start_url)
+    
+    @staticmethod
+    def _origin(url: str) -> Optional[str]:
+        """scheme://host[:port] of an http(s) URL, None for anything else"""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            return None
+        return f"{parts.scheme}://{parts.netloc}"
+    
+    def available(self) -> int:
+        """Number of idle drivers"""
+        return self._drivers.qsize()
+    
+    def close(self):
+        """Quit every idle driver"""
+        while True:
+            try:
+                driver = self._drivers.get_nowait()
+            except queue.Empty:
+                break
+            if driver is not None:
+                driver.quit()
@@ -4,6 +4,7 @@ Test the webhook locally before deploying to Railway
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Load sample application data
@@ -21,10 +22,18 @@ print("="*80)
 # Test endpoints
 BASE_URL = "http://localhost:5000"
 
+# One keep-alive connection shared by all requests
+session = requests.Session()
+
+# The two quick GET checks are independent, so send them together
+with ThreadPoolExecutor(max_workers=2) as executor:
+    health_future = executor.submit(session.get, f"{BASE_URL}/health", timeout=5)
+    docs_future = executor.submit(session.get, f"{BASE_URL}/", timeout=5)
+
 # Test 1: Health check
 print("\n[Test 1] Health Check...")
 try:
-    response = requests.get(f"{BASE_URL}/health", timeout=5)
+    response = health_future.result()
     if response.status_code == 200:
         print("✓ Health check passed")
         print(f"  Response: {response.json()}")
@@ -38,7 +47,7 @@ except Exception as e:
 # Test 2: API documentation
 print("\n[Test 2] API Documentation...")
 try:
-    response = requests.get(f"{BASE_URL}/", timeout=5)
+    response = docs_future.result()
     if response.status_code == 200:
         print("✓ API docs accessible")
         docs = response.json()
@@ -53,17 +62,19 @@ except Exception as e:
 print("\n[Test 3] Generate PDF (this will take ~40 seconds)...")
 try:
     print("  Sending application data...")
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/generate-visa-pdf",
         json=application_data,
-        timeout=120
+        timeout=(5, 120),
+        stream=True
     )
     
     if response.status_code == 200:
-        # Save PDF
+        # Save PDF, writing it to disk as it arrives
         output_path = Path('test_webhook_output.pdf')
         with open(output_path, 'wb') as f:
-            f.write(response.content)
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                f.write(chunk)
         
         file_size = output_path.stat().st_size / 1024
         print(f"✓ PDF generated successfully!")